@@ -1,24 +1,32 @@
 # ai_agents.py
 """
 Agentes IA para Azul: Greedy, Minimax (simples) e MCTS (simples).
-Cada agente é uma subclasse de jogador.Jogador e sobrescreve escolher_jogada.
+Cada agente é uma subclasse de jogador.Jogador e sobrescreve _decidir (chamado por
+escolher_jogada). Com a instrumentação ligada (Jogador.instrumentacao, ver instrumentacao.py)
+cada agente preenche contadores da decisão: rollouts, jogadas simuladas, nós, cortes etc.
 Não altera nenhum outro módulo do seu projeto.
 """
 
-import copy
 import math
 import random
 import time
+import rastreio
+from aleatorio import derivar_semente
 from jogador import Jogador
 from tabuleiro import Tabuleiro
 from jogo import Jogo
 from azulejos import CorAzulejo
+from transposicao import TabelaTransposicao, EXATO, LIMITE_INFERIOR, LIMITE_SUPERIOR
+from zobrist import ZOB_VEZ
+from movimentos import FONTE_CENTRO, listar_movimentos, para_opcao, para_escolha
+from paralelo import obter_pool
+from serializacao import serializar_jogo, desserializar_jogo
 
 # ---------- Helpers ----------
 
 def clone_game(game):
-    """Deep copy do objeto Jogo (usa copy.deepcopy)."""
-    return copy.deepcopy(game)
+    """Cópia do objeto Jogo para simulação (usa Jogo.clonar, bem mais rápido que copy.deepcopy)."""
+    return game.clonar()
 
 def avaliar_jogo_simples(game, jogador_idx):
     """
@@ -32,8 +40,8 @@ def avaliar_jogo_simples(game, jogador_idx):
     jogador = game.jogadores[jogador_idx]
     score = jogador.pontos
     # contar peças já na parede
-    cnt_wall = sum(1 for r in range(5) for c in range(5) if jogador.tabuleiro.parede[r][c] is not None)
-    cnt_lines = sum(len(l) for l in jogador.tabuleiro.linhas)
+    cnt_wall = jogador.tabuleiro.pecas_na_parede()
+    cnt_lines = jogador.tabuleiro.pecas_nas_linhas()
     # less weight for lines, more for wall
     score += 1.0 * cnt_wall + 0.5 * cnt_lines
     # penalty approximate from floor
@@ -57,76 +65,95 @@ def gerar_opcoes_para_jogador(game, jogador_idx):
     idx: expositor index (0-based) ou None
     cor: CorAzulejo
     linha: 0..4 or -1 para piso
+    Os agentes usam direto as jogadas inteiras de movimentos.listar_movimentos (mesma ordem).
     """
-    jogador = game.jogadores[jogador_idx]
-    expositores = game.expositores
-    centro = game.centro
+    return [para_opcao(m) for m in listar_movimentos(game, jogador_idx)]
 
-    opcoes = []
-    # expositores
-    for i, e in enumerate(expositores):
-        if e.vazio():
-            continue
-        cores = e.cores_disponiveis()
-        for cor in cores:
-            # para cada linha possível para este jogador
-            linhas_validas = [r for r in range(5) if jogador.tabuleiro.pode_colocar_na_linha(r, cor)]
-            if not linhas_validas:
-                opcoes.append(("expositor", i, cor, -1))
-            else:
-                for ln in linhas_validas:
-                    opcoes.append(("expositor", i, cor, ln))
-    # centro
-    if centro.azulejos or centro.token_primeiro:
-        cores = centro.cores_disponiveis()
-        for cor in cores:
-            linhas_validas = [r for r in range(5) if jogador.tabuleiro.pode_colocar_na_linha(r, cor)]
-            if not linhas_validas:
-                opcoes.append(("centro", None, cor, -1))
-            else:
-                for ln in linhas_validas:
-                    opcoes.append(("centro", None, cor, ln))
-    # se nenhuma opção (teoricamente não acontece), deixe None
-    return opcoes
+def opcao_para_escolha(opcao):
+    """Converte uma opção (fonte, idx, cor, linha) no dict aceito por Jogo.aplicar."""
+    return {"fonte": (opcao[0], opcao[1]), "cor": opcao[2], "linha": opcao[3]}
 
 def aplicar_escolha_simulada(game, jogador_idx, escolha):
     """
-    Aplica a escolha ao game (mutates game). Reusa _aplicar_escolha do Jogo
-    mas como é método "privado" no seu Jogo, replicamos a lógica mínima aqui.
-    Para manter compatibilidade, chamamos game._aplicar_escolha se existir.
+    Aplica a escolha ao game (mutates game) via Jogo.aplicar e retorna o registro
+    para game.desfazer(...). As buscas aplicam e desfazem jogadas no mesmo objeto
+    em vez de clonar o jogo a cada nó.
     """
-    # se a classe Jogo expõe _aplicar_escolha, podemos usá-la (mantive compatibilidade)
-    try:
-        jogador = game.jogadores[jogador_idx]
-        # adaptar o formato que Jogo._aplicar_escolha espera: jogador (objeto) e escolha (dict)
-        game._aplicar_escolha(jogador, escolha)
-    except Exception:
-        # fallback: tentativa manual (menos ideal)
-        fonte = escolha["fonte"]
-        cor = escolha["cor"]
-        linha = escolha["linha"]
-        jogador = game.jogadores[jogador_idx]
-        escolhidos = []
-        took_token = False
-
-        if fonte[0] == "expositor":
-            idx = fonte[1]
-            escolhidos, resto = game.expositores[idx].retirar_cor(cor)
-            if resto:
-                game.centro.adicionar(resto)
-        else:
-            escolhidos, took_token = game.centro.retirar_cor(cor)
-            if took_token:
-                if game.owner_first_token is None:
-                    game.owner_first_token = jogador
+    return game.aplicar(jogador_idx, escolha)
+
+def pontos_apos_rodada(game, jogador_idx):
+    """Pontos do jogador se a rodada terminasse agora (sem executar fase_parede_e_pontuacao)."""
+    jogador = game.jogadores[jogador_idx]
+    return jogador.pontos + jogador.tabuleiro.pontos_fim_rodada()
 
-        if linha == -1:
-            jogador.tabuleiro.piso += escolhidos
+def estimativa_parcial(game, jogador_idx):
+    """
+    pontos_apos_rodada + 0.5 por peça em linha padrão incompleta (que fica para a rodada
+    seguinte): mesma escala para playouts truncados e para os que já chegaram ao fim da rodada.
+    """
+    tabuleiro = game.jogadores[jogador_idx].tabuleiro
+    incompletas = sum(q for i, q in enumerate(tabuleiro.linha_qtd) if q <= i)
+    return pontos_apos_rodada(game, jogador_idx) + 0.5 * incompletas
+
+def escolha_gulosa(game, jogador_idx, choices):
+    """
+    Jogada de `choices` que maximiza avaliar_jogo_simples após aplicada (a primeira, em empate).
+    Política rápida dos playouts: compara só a variação da avaliação (a atual é comum a todas
+    as jogadas), calculada direto do estado sem aplicar/desfazer nem copiar o jogo: +0.5 por
+    peça que entra na linha, -0.5 por peça que transborda (ou vai direto) para o piso e -1
+    pelo token do primeiro jogador; a parede e os pontos não mudam durante a coleta.
+    O cálculo fica no laço para não pagar uma chamada de função por jogada
+    (verificacao.gulosa confere contra aplicar/avaliar/desfazer).
+    """
+    centro = game.centro
+    contagem_centro = centro.contagem
+    token = 1.0 if centro.token_primeiro else 0.0
+    expositores = game.expositores
+    linha_qtd = game.jogadores[jogador_idx].tabuleiro.linha_qtd
+    bestc = None
+    bestv = -float("inf")
+    for c in choices:
+        f = c >> 6
+        k = (c >> 3) & 7
+        linha = (c & 7) - 1
+        if f == FONTE_CENTRO:
+            qtd = contagem_centro[k]
+            v = -token
         else:
-            jogador.tabuleiro.adicionar_a_linha(linha, escolhidos, to_floor_if_excess=True)
+            qtd = expositores[f - 1].contagem[k]
+            v = 0.0
+        if linha < 0:
+            v -= 0.5 * qtd
+        else:
+            na_linha = linha + 1 - linha_qtd[linha]
+            if qtd < na_linha:
+                na_linha = qtd
+            v += 0.5 * (2 * na_linha - qtd)
+        if v > bestv:
+            bestv = v
+            bestc = c
+    return bestc
+
+class Orcamento:
+    """
+    Limite de uma decisão: tempo (segundos, relógio de parede) e/ou nós (jogadas simuladas
+    ou nós da busca, conforme o agente). Sem nenhum dos dois, nunca se esgota.
+    """
+
+    __slots__ = ("prazo", "nos")
 
-        if took_token:
-            jogador.tabuleiro.piso.append("TOKEN")
+    def __init__(self, tempo=None, nos=None):
+        self.prazo = time.perf_counter() + tempo if tempo else None
+        self.nos = nos
+
+    @property
+    def ativo(self):
+        return self.prazo is not None or self.nos is not None
+
+    def esgotado(self, nos_usados):
+        if self.nos is not None and nos_usados >= self.nos:
+            return True
+        return self.prazo is not None and time.perf_counter() >= self.prazo
 
 # ---------- Agentes ----------
 
@@ -135,14 +162,45 @@ class GreedyAgent(Jogador):
     Greedy via simulações rápidas:
     Para cada opção legal, simula N playouts (jogadores adversários jogam com heurística aleatória/greedy)
     e escolhe a opção com maior média de pontos obtidos ao final da rodada.
+    Com tempo_limite (s) e/ou limite_nos (jogadas simuladas) os playouts são feitos em passadas
+    sobre todas as opções, até sim_per_option passadas ou até o orçamento acabar; o orçamento
+    é assim dividido igualmente entre as opções. Se acabar ainda na primeira passada, a escolha
+    fica entre as opções já simuladas.
+    O playout termina no fim da rodada (sem sorteio do saco), então só há acaso com
+    opponent_policy="random": com "greedy" (ou "first") todos os playouts de uma opção dão
+    o mesmo resultado e cada opção é simulada uma vez só. As respostas greedy dos jogadores
+    ficam memorizadas pela chave Zobrist do estado (+ jogador da vez) durante a rodada,
+    valendo para todas as opções e decisões: estados repetidos não são reavaliados.
+    Eliminação sucessiva (successive halving, padrão): as opções são primeiro comparadas por
+    playouts truncados em 1, 2, 4, ... jogadas (estimativa_parcial) e, a cada etapa, só a
+    metade melhor segue; quando restam `finalistas` opções, elas recebem os playouts completos.
+    Cada etapa custa ~uma jogada simulada por opção inicial, bem menos que um playout inteiro
+    por opção. Com orçamento, a escolha fica entre as opções da etapa mais avançada já
+    simuladas (cada etapa as simula na ordem da anterior, da melhor para a pior).
+    eliminacao=False volta a simular todas as opções até o fim.
+    lote=True: os playouts de cada etapa rodam juntos no motor vetorizado (lote.py, exige
+    NumPy), um estado do lote por opção (e por repetição, com "random"); mesmos valores do
+    playout em Python para "greedy"/"first". O orçamento é conferido entre etapas.
     """
 
-    def __init__(self, nome, tipo="cpu", sim_per_option=12, opponent_policy="greedy"):
-        super().__init__(nome, tipo=tipo)
+    def __init__(self, nome, tipo="cpu", sim_per_option=12, opponent_policy="greedy", rng=None,
+                 tempo_limite=None, limite_nos=None, eliminacao=True, finalistas=8, lote=False):
+        super().__init__(nome, tipo=tipo, rng=rng)
         self.sim_per_option = sim_per_option
+        self.eliminacao = eliminacao
+        self.finalistas = finalistas
+        self.lote = lote
         self.opponent_policy = opponent_policy
+        self.tempo_limite = tempo_limite
+        self.limite_nos = limite_nos
+        self._respostas = {}  # chave do estado ^ ZOB_VEZ[jogador] -> jogada greedy
+        self._respostas_rodada = None
+
+    def _limpar_busca(self):
+        self._respostas = {}
+        self._respostas_rodada = None
 
-    def escolher_jogada(self, estado):
+    def _decidir(self, estado, contadores):
         # construir um Game "simulado" a partir do estado
         # estado contém expositores e centro - mas não contem objeto Jogo completo.
         # Para simular, vamos esperar que exista um Jogo em estado["game"] (simulator passa isso).
@@ -152,58 +210,149 @@ class GreedyAgent(Jogador):
             # fallback: use the lightweight cpu from Jogador
             return super()._escolha_cpu(estado)
 
-        opcoes = gerar_opcoes_para_jogador(game, me_idx)
+        opcoes = listar_movimentos(game, me_idx)
         if not opcoes:
             return None
 
-        best = None
-        best_score = -float("inf")
-        for opc in opcoes:
-            total = 0.0
-            for _ in range(self.sim_per_option):
-                g = clone_game(game)
-                aplicar_escolha_simulada(g, me_idx, {"fonte": (opc[0], opc[1]), "cor": opc[2], "linha": opc[3]})
-                # continuar a rodada com políticas simples até esgotar fontes
-                # (faremos jogadores na ordem circular a partir do próximo)
-                # rollout: outros jogadores usam greedy-like quick policy
-                rollout_players = list(range(len(g.jogadores)))
-                # a rodada continua com a ordem circular a partir do jogador após me_idx
-                next_offset = 1
-                while not g._todas_fontes_vazias():
-                    current_idx = (me_idx + next_offset) % len(g.jogadores)
-                    # skip if current player has no legal options (shouldn't happen normally)
-                    choices = gerar_opcoes_para_jogador(g, current_idx)
-                    if not choices:
-                        next_offset += 1
-                        continue
-                    # pick a choice according to opponent_policy
-                    if self.opponent_policy == "greedy":
-                        # choose option that maximizes quick heuristic after applying
-                        bestc = None
-                        bestv = -float("inf")
-                        for c in choices:
-                            gg = clone_game(g)
-                            aplicar_escolha_simulada(gg, current_idx, {"fonte": (c[0], c[1]), "cor": c[2], "linha": c[3]})
-                            v = avaliar_jogo_simples(gg, current_idx)
-                            if v > bestv:
-                                bestv = v
-                                bestc = c
-                        escolha = {"fonte": (bestc[0], bestc[1]), "cor": bestc[2], "linha": bestc[3]}
-                    else:
-                        escolha = {"fonte": (choices[0][0], choices[0][1]), "cor": choices[0][2], "linha": choices[0][3]}
-                    aplicar_escolha_simulada(g, current_idx, escolha)
+        orcamento = Orcamento(self.tempo_limite, self.limite_nos)
+        jogadas = avaliacoes = rollouts = respostas_memorizadas = 0
+        rast = rastreio.ATIVO
+        gulosa = self.opponent_policy == "greedy"
+        aleatoria = self.opponent_policy == "random"
+        if game.rodada != self._respostas_rodada:
+            self._respostas.clear()
+            self._respostas_rodada = game.rodada
+        respostas = self._respostas
+
+        def playout(opc, horizonte=None):
+            """Pontos de me_idx ao fim da rodada; com horizonte, estimativa_parcial após `horizonte` jogadas."""
+            nonlocal jogadas, avaliacoes, respostas_memorizadas
+            if rast:
+                rast.abrir("rollout")
+            # simulação no próprio jogo: cada jogada é desfeita no final do playout
+            pilha = [game.aplicar_movimento(me_idx, opc)]
+            # continuar a rodada com políticas simples até esgotar fontes
+            # (faremos jogadores na ordem circular a partir do próximo)
+            # rollout: outros jogadores usam greedy-like quick policy
+            next_offset = 1
+            while not game._todas_fontes_vazias() and (horizonte is None or len(pilha) < horizonte):
+                current_idx = (me_idx + next_offset) % len(game.jogadores)
+                chave = game.hash ^ ZOB_VEZ[current_idx]
+                escolha = respostas.get(chave) if gulosa else None
+                if escolha is not None:
+                    respostas_memorizadas += 1
+                    pilha.append(game.aplicar_movimento(current_idx, escolha))
                     next_offset += 1
-                # finalizar rodada para computar pontos ganhos
-                # usamos fase_parede_e_pontuacao do jogo para que pontos sejam aplicados
-                # observe que fase_parede_e_pontuacao aplica para todos jogadores e usa saco.descartar etc.
-                g.fase_parede_e_pontuacao()
-                total += g.jogadores[me_idx].pontos
-            avg = total / max(1, self.sim_per_option)
+                    continue
+                # skip if current player has no legal options (shouldn't happen normally)
+                choices = listar_movimentos(game, current_idx)
+                if not choices:
+                    next_offset += 1
+                    continue
+                # pick a choice according to opponent_policy
+                if gulosa:
+                    # choose option that maximizes quick heuristic after applying
+                    escolha = respostas[chave] = escolha_gulosa(game, current_idx, choices)
+                    avaliacoes += len(choices)
+                elif aleatoria:
+                    escolha = self.rng.choice(choices)
+                else:
+                    escolha = choices[0]
+                pilha.append(game.aplicar_movimento(current_idx, escolha))
+                next_offset += 1
+            jogadas += len(pilha)
+            # pontos ganhos ao final da rodada (equivalente a fase_parede_e_pontuacao)
+            if horizonte is None:
+                pontos = pontos_apos_rodada(game, me_idx)
+            else:
+                pontos = estimativa_parcial(game, me_idx)
+            for registro in reversed(pilha):
+                game.desfazer(registro)
+            if rast:
+                rast.fechar("rollout")
+            return pontos
+
+        # playouts determinísticos: repetir só refaz o mesmo cálculo
+        passadas = self.sim_per_option if aleatoria else min(self.sim_per_option, 1)
+        if self.lote:
+            # NumPy só é necessário neste modo
+            import numpy as np
+            from lote import LoteRodadas
+            politica_lote = "greedy" if gulosa else "random" if aleatoria else "first"
+            rng_lote = np.random.default_rng(self.rng.getrandbits(64)) if aleatoria else None
+        candidatas = list(range(len(opcoes)))
+        esgotado = False
+        etapas = 0
+
+        def avaliar_lote(indices, horizonte, n_passadas):
+            """Como avaliar, com todos os playouts da etapa num LoteRodadas."""
+            nonlocal rollouts, jogadas, esgotado
+            if rollouts and orcamento.esgotado(jogadas):
+                esgotado = True
+                return []
+            movs = np.repeat([opcoes[i] for i in indices], n_passadas)
+            lote = LoteRodadas.de_jogo(game, len(movs), vez=me_idx)
+            lote.aplicar(np.arange(len(movs)), movs >> 6, (movs >> 3) & 7, (movs & 7) - 1)
+            jogadas += len(movs) + lote.jogar(politica_lote, None if horizonte is None else horizonte - 1,
+                                               rng_lote)
+            rollouts += len(movs)
+            if horizonte is None:
+                valores = lote.pontos[:, me_idx] + lote.pontos_fim_rodada()[:, me_idx]
+            else:
+                valores = lote.estimativa_parcial(me_idx)
+            medias = valores.reshape(len(indices), n_passadas).mean(axis=1)
+            return [(float(v), i) for v, i in zip(medias, indices)]
+
+        def avaliar(indices, horizonte, n_passadas):
+            """Média por opção (na ordem de indices) em passadas; para no fim do orçamento."""
+            nonlocal rollouts, esgotado
+            if self.lote:
+                return avaliar_lote(indices, horizonte, n_passadas)
+            totais = [0.0] * len(indices)
+            feitas = [0] * len(indices)
+            for _ in range(n_passadas):
+                for j, i in enumerate(indices):
+                    if rollouts and orcamento.esgotado(jogadas):
+                        esgotado = True
+                        break
+                    totais[j] += playout(opcoes[i], horizonte)
+                    feitas[j] += 1
+                    rollouts += 1
+                if esgotado:
+                    break
+            return [(totais[j] / feitas[j], i) for j, i in enumerate(indices) if feitas[j]]
+
+        horizonte = 1
+        medias = []
+        while self.eliminacao and len(candidatas) > self.finalistas and not esgotado:
+            etapa = avaliar(candidatas, horizonte, 1)
+            if etapa:
+                medias = etapa
+            etapas += 1
+            if esgotado:
+                break
+            # estável: em empate fica a opção que veio antes
+            etapa.sort(key=lambda m: -m[0])
+            candidatas = [i for _, i in etapa[:max(self.finalistas, (len(etapa) + 1) // 2)]]
+            horizonte *= 2
+        if not esgotado:
+            final = avaliar(candidatas, None, passadas)
+            if final:
+                medias = final
+
+        best = opcoes[0]
+        best_score = -float("inf")
+        for avg, i in sorted(medias, key=lambda m: m[1]):
             if avg > best_score:
                 best_score = avg
-                best = opc
-        fonte = (best[0], best[1])
-        return {"fonte": fonte, "cor": best[2], "linha": best[3]}
+                best = opcoes[i]
+        if contadores is not None:
+            contadores.update(opcoes=len(opcoes), rollouts=rollouts,
+                              jogadas_simuladas=jogadas, avaliacoes=avaliacoes,
+                              respostas_memorizadas=respostas_memorizadas,
+                              etapas=etapas, finalistas=len(candidatas),
+                              orcamento_esgotado=esgotado)
+        return para_escolha(best)
 
 
 class MinimaxAgent(Jogador):
@@ -212,191 +361,463 @@ class MinimaxAgent(Jogador):
     - Considera apenas a rodada atual (não gera novas rodadas nem reembaralha o saco).
     - Depth limitado (padrão 2 ply: eu -> adversário).
     - Em nós chance (se houver escolhas com incerteza) usamos amostragem aleatória.
+    - Tabela de transposição (chave Zobrist do jogo + jogador da vez) reaproveita posições
+      repetidas por ordens diferentes de jogadas, também entre decisões da mesma rodada.
+      Só valores da mesma profundidade são reutilizados, então o resultado é o mesmo da
+      busca sem tabela; a melhor opção guardada é tentada primeiro (mais cortes).
+    - Com tempo_limite (s) e/ou limite_nos, usa aprofundamento iterativo (1, 2, ... até
+      profundidade_max) e devolve a melhor jogada da maior profundidade concluída; a busca
+      interrompida no meio é descartada. Sem orçamento, busca só em `depth`, como antes.
+    - processos > 1 (só sem orçamento): as opções da raiz são buscadas em paralelo num pool
+      persistente (paralelo.py), uma tarefa por opção. A raiz usa janela cheia para cada
+      opção, então os valores e a jogada escolhida são os mesmos da busca serial; cada
+      processo tem a sua tabela de transposição.
     Observação: é uma aproximação e é relativamente custosa; limite de profundidade recomendado 2-3.
     """
 
-    def __init__(self, nome, tipo="cpu", depth=2, samples_per_chance=3):
-        super().__init__(nome, tipo=tipo)
+    def __init__(self, nome, tipo="cpu", depth=2, samples_per_chance=3, rng=None, tt_max_entradas=200_000,
+                 tempo_limite=None, limite_nos=None, profundidade_max=20, processos=1):
+        super().__init__(nome, tipo=tipo, rng=rng)
         self.depth = depth
         self.samples = samples_per_chance
+        self.tt = TabelaTransposicao(tt_max_entradas)
+        self._tt_contexto = None
+        self.tempo_limite = tempo_limite
+        self.limite_nos = limite_nos
+        self.profundidade_max = profundidade_max
+        self.processos = processos
+
+    def _limpar_busca(self):
+        self.tt = TabelaTransposicao(self.tt.max_entradas)
 
-    def escolher_jogada(self, estado):
+    def _decidir(self, estado, contadores):
         game = estado.get("game")
         me_idx = estado.get("indice_jogador", 0)
         if game is None:
             return super()._escolha_cpu(estado)
 
+        # escolher melhor jogada executando minimax para cada opção do jogador atual
+        # (busca no próprio jogo, aplicando e desfazendo as jogadas)
+        opcoes = listar_movimentos(game, me_idx)
+        if not opcoes:
+            return None
+        if self.processos > 1 and self.tempo_limite is None and self.limite_nos is None:
+            best, estatisticas = self._buscar_paralelo(game, me_idx, opcoes)
+        else:
+            best, _, estatisticas = self._buscar(game, me_idx, opcoes)
+        if contadores is not None:
+            contadores.update(estatisticas)
+        return para_escolha(best)
+
+    def _buscar_paralelo(self, game, me_idx, opcoes):
+        """Uma tarefa por opção da raiz (_minimax_em_processo); empate fica com a primeira opção."""
+        dados = serializar_jogo(game)
+        tarefas = [(dados, me_idx, o, self.depth, self.tt.max_entradas) for o in opcoes]
+        best = None
+        bestval = -float("inf")
+        estatisticas = dict(opcoes=len(opcoes), nos=0, folhas=0, cortes=0, tt_acertos=0)
+        for o, (v, parciais) in zip(opcoes, obter_pool(self.processos).map(_minimax_em_processo, tarefas)):
+            if v > bestval:
+                bestval = v
+                best = o
+            for k in ("nos", "folhas", "cortes", "tt_acertos"):
+                estatisticas[k] += parciais[k]
+        estatisticas.update(profundidade=self.depth, processos=self.processos)
+        return best, estatisticas
+
+    def _buscar(self, game, me_idx, opcoes):
+        """
+        Busca alfa-beta (com aprofundamento iterativo se houver orçamento) sobre as opções
+        dadas da raiz. Retorna (melhor opção, valor dela, contadores da busca).
+        """
+        nos = folhas = cortes = tt_acertos = 0
+        orcamento = Orcamento(self.tempo_limite, self.limite_nos)
+        interrompida = False  # orçamento acabou no meio de uma iteração
+        limitada = False      # alguma folha foi cortada pela profundidade (e não pelo fim da rodada)
+
+        # o hash não cobre os pontos (mudam só no fim da rodada) nem o jogador maximizado:
+        # quando um deles muda, as entradas antigas deixam de valer
+        contexto = (me_idx, tuple(j.pontos for j in game.jogadores))
+        if contexto != self._tt_contexto:
+            self.tt.limpar()
+            self._tt_contexto = contexto
+        tt = self.tt
+
         def minimax(g, current_idx, depth, alpha, beta, maximizing_idx):
             """
             Retorna valor heurístico para jogador maximizing_idx.
             current_idx: índice do jogador que joga no nó atual.
+            Com o orçamento esgotado, marca `interrompida` e volta sem valor útil
+            (as jogadas aplicadas são desfeitas na volta e nada é guardado na TT).
             """
-            if depth == 0 or g._todas_fontes_vazias():
+            nonlocal nos, folhas, cortes, tt_acertos, interrompida, limitada
+            nos += 1
+            if orcamento_ativo and not nos & 63 and orcamento.esgotado(nos):
+                interrompida = True
+            if interrompida:
+                return 0.0
+            if g._todas_fontes_vazias():
+                folhas += 1
+                return avaliar_jogo_simples(g, maximizing_idx)
+            if depth == 0:
+                folhas += 1
+                limitada = True
                 return avaliar_jogo_simples(g, maximizing_idx)
 
+            chave = g.hash ^ ZOB_VEZ[current_idx]
+            entrada = tt.buscar(chave)
+            melhor_tt = None
+            if entrada is not None:
+                e_depth, e_valor, e_tipo, melhor_tt = entrada
+                if e_depth == depth and (e_tipo == EXATO
+                                         or (e_tipo == LIMITE_INFERIOR and e_valor >= beta)
+                                         or (e_tipo == LIMITE_SUPERIOR and e_valor <= alpha)):
+                    tt_acertos += 1
+                    limitada = True  # o valor guardado pode vir de uma subárvore cortada pela profundidade
+                    return e_valor
+
             # gerar opções do current_idx
-            opts = gerar_opcoes_para_jogador(g, current_idx)
+            opts = listar_movimentos(g, current_idx)
             if not opts:
                 # pular para o próximo jogador
                 next_idx = (current_idx + 1) % len(g.jogadores)
                 return minimax(g, next_idx, depth, alpha, beta, maximizing_idx)
+            if melhor_tt is not None and melhor_tt in opts:
+                # opts é a tupla compartilhada do cache de jogadas: reordenar numa cópia
+                opts = [melhor_tt] + [o for o in opts if o != melhor_tt]
 
+            alpha_inicial, beta_inicial = alpha, beta
+            melhor = None
             if current_idx == maximizing_idx:
                 value = -float("inf")
                 for o in opts:
-                    gg = clone_game(g)
-                    aplicar_escolha_simulada(gg, current_idx, {"fonte": (o[0], o[1]), "cor": o[2], "linha": o[3]})
-                    next_idx = (current_idx + 1) % len(gg.jogadores)
-                    v = minimax(gg, next_idx, depth-1, alpha, beta, maximizing_idx)
+                    registro = g.aplicar_movimento(current_idx, o)
+                    next_idx = (current_idx + 1) % len(g.jogadores)
+                    v = minimax(g, next_idx, depth-1, alpha, beta, maximizing_idx)
+                    g.desfazer(registro)
+                    if interrompida:
+                        return 0.0
                     if v > value:
                         value = v
+                        melhor = o
                     alpha = max(alpha, value)
                     if alpha >= beta:
+                        cortes += 1
                         break
-                return value
             else:
                 # minimizing (opponent) - assume they minimize our heuristic
                 value = float("inf")
                 for o in opts:
-                    gg = clone_game(g)
-                    aplicar_escolha_simulada(gg, current_idx, {"fonte": (o[0], o[1]), "cor": o[2], "linha": o[3]})
-                    next_idx = (current_idx + 1) % len(gg.jogadores)
-                    v = minimax(gg, next_idx, depth-1, alpha, beta, maximizing_idx)
+                    registro = g.aplicar_movimento(current_idx, o)
+                    next_idx = (current_idx + 1) % len(g.jogadores)
+                    v = minimax(g, next_idx, depth-1, alpha, beta, maximizing_idx)
+                    g.desfazer(registro)
+                    if interrompida:
+                        return 0.0
                     if v < value:
                         value = v
+                        melhor = o
                     beta = min(beta, value)
                     if beta <= alpha:
+                        cortes += 1
                         break
-                return value
 
-        # escolher melhor jogada executando minimax para cada opção do jogador atual
-        opcoes = gerar_opcoes_para_jogador(game, me_idx)
-        if not opcoes:
-            return None
-        best = None
-        bestval = -float("inf")
-        for o in opcoes:
-            gg = clone_game(game)
-            aplicar_escolha_simulada(gg, me_idx, {"fonte": (o[0], o[1]), "cor": o[2], "linha": o[3]})
-            next_idx = (me_idx + 1) % len(gg.jogadores)
-            v = minimax(gg, next_idx, self.depth-1, -float("inf"), float("inf"), me_idx)
-            if v > bestval:
-                bestval = v
-                best = o
-        fonte = (best[0], best[1])
-        return {"fonte": fonte, "cor": best[2], "linha": best[3]}
+            if value <= alpha_inicial:
+                tipo = LIMITE_SUPERIOR
+            elif value >= beta_inicial:
+                tipo = LIMITE_INFERIOR
+            else:
+                tipo = EXATO
+            tt.guardar(chave, depth, value, tipo, melhor)
+            return value
+
+        def buscar_raiz(profundidade):
+            """(melhor, valor) da raiz em `profundidade`; se interrompida, o melhor entre as opções já concluídas."""
+            best = None
+            bestval = -float("inf")
+            for o in opcoes:
+                registro = game.aplicar_movimento(me_idx, o)
+                next_idx = (me_idx + 1) % len(game.jogadores)
+                v = minimax(game, next_idx, profundidade-1, -float("inf"), float("inf"), me_idx)
+                game.desfazer(registro)
+                if interrompida:
+                    break
+                if v > bestval:
+                    bestval = v
+                    best = o
+            return best, bestval
+
+        orcamento_ativo = orcamento.ativo
+        profundidade_concluida = 0
+        if not orcamento_ativo:
+            best, bestval = buscar_raiz(self.depth)
+            profundidade_concluida = self.depth
+        else:
+            best = None
+            bestval = -float("inf")
+            for profundidade in range(1, self.profundidade_max + 1):
+                limitada = False
+                melhor_iteracao, valor_iteracao = buscar_raiz(profundidade)
+                if interrompida:
+                    # só a primeira iteração aproveita o resultado parcial (nada melhor disponível)
+                    if best is None:
+                        best, bestval = melhor_iteracao, valor_iteracao
+                    break
+                best, bestval = melhor_iteracao, valor_iteracao
+                profundidade_concluida = profundidade
+                if not limitada or orcamento.esgotado(nos):
+                    break  # a rodada inteira coube na busca: mais profundidade não muda nada
+            if best is None:
+                best = opcoes[0]
+        estatisticas = dict(opcoes=len(opcoes), nos=nos, folhas=folhas, cortes=cortes,
+                            tt_acertos=tt_acertos, tt_entradas=len(tt),
+                            profundidade=profundidade_concluida)
+        return best, bestval, estatisticas
 
 
 class MCTSAgent(Jogador):
     """
-    MCTS simples:
-    - Cada decisão executa N iterações de MCTS.
-    - Rollout policy: greedy quick (avaliar_jogo_simples) ou aleatório.
-    - Tree keyed by deep-copied game state (repr of board).
-    Limitações: para manter simplicidade e compatibilidade com o seu Jogo, a árvore é reconstruída a cada decisão.
+    MCTS sobre a rodada atual:
+    - Cada decisão executa N iterações de seleção (UCB), expansão de um nó, rollout e retropropagação.
+    - A árvore tem vários níveis: cada nó é o estado após a jogada que leva a ele, com o jogador
+      da vez guardado no nó. Nos nós do agente a seleção maximiza os pontos dele ao fim da rodada;
+      nos nós dos adversários, minimiza (mesma suposição do MinimaxAgent).
+    - Rollout policy: greedy quick (escolha_gulosa) ou aleatório.
+    - Iterações e rollouts rodam no próprio jogo (Jogo.aplicar/desfazer), sem clonar o estado.
+    - A árvore é mantida entre decisões: na jogada seguinte, o nó cuja chave (hash Zobrist +
+      jogador da vez) é a do estado atual (a nossa jogada seguida das respostas dos adversários)
+      vira a nova raiz, com as visitas já acumuladas. Numa rodada nova a árvore recomeça.
+    - tempo_limite (s) e/ou limite_nos (jogadas simuladas) param as iterações quando o orçamento
+      acaba; iterations continua sendo o máximo (None = só o orçamento limita).
+    - processos > 1: root parallelization num pool persistente (paralelo.py); cada processo faz
+      a busca inteira (iterations/orçamento) e as estatísticas da raiz são somadas.
     """
 
     class Node:
-        def __init__(self, parent, move):
+        def __init__(self, parent, move, jogador=None, chave=None):
             self.parent = parent
             self.move = move  # move that led to this node from parent
             self.children = []
             self.visits = 0
             self.value = 0.0
-
-    def __init__(self, nome, tipo="cpu", iterations=200, rollout_limit=200):
-        super().__init__(nome, tipo=tipo)
+            self.jogador = jogador  # quem joga a partir deste nó
+            self.chave = chave  # hash do jogo ^ ZOB_VEZ[jogador], para reencontrar o nó
+            self.nao_expandidas = None  # jogadas ainda sem filho (na ordem de listar_movimentos)
+
+    def __init__(self, nome, tipo="cpu", iterations=200, rollout_limit=200, rng=None,
+                 tempo_limite=None, limite_nos=None, reaproveitar_arvore=True, processos=1):
+        # rng: gerador próprio do agente (não reinicializa o random global)
+        super().__init__(nome, tipo=tipo, rng=rng)
+        if iterations is None and tempo_limite is None and limite_nos is None:
+            raise ValueError("iterations=None exige tempo_limite ou limite_nos")
         self.iterations = iterations
         self.rollout_limit = rollout_limit
-        random.seed()
-
-    def escolher_jogada(self, estado):
+        self.tempo_limite = tempo_limite
+        self.limite_nos = limite_nos
+        self.reaproveitar_arvore = reaproveitar_arvore
+        self.processos = processos
+        self._arvore = None  # nó da jogada escolhida na decisão anterior
+
+    def _limpar_busca(self):
+        self._arvore = None
+
+    def _raiz(self, game, me_idx):
+        """Subárvore da decisão anterior que corresponde ao estado atual, ou uma raiz nova."""
+        chave = game.hash ^ ZOB_VEZ[me_idx]
+        anterior, self._arvore = self._arvore, None
+        if anterior is not None and self.reaproveitar_arvore:
+            # a nova raiz está no máximo uma volta de jogadas abaixo do nó escolhido
+            nivel = [anterior]
+            for _ in range(len(game.jogadores)):
+                for node in nivel:
+                    if node.chave == chave and node.jogador == me_idx:
+                        node.parent = None
+                        node.move = None
+                        return node
+                nivel = [c for node in nivel for c in node.children]
+        return MCTSAgent.Node(parent=None, move=None, jogador=me_idx, chave=chave)
+
+    def _decidir(self, estado, contadores):
         game = estado.get("game")
         me_idx = estado.get("indice_jogador", 0)
         if game is None:
             return super()._escolha_cpu(estado)
 
-        root = MCTSAgent.Node(parent=None, move=None)
-
-        legal_moves = gerar_opcoes_para_jogador(game, me_idx)
+        legal_moves = listar_movimentos(game, me_idx)
         if not legal_moves:
             return None
+        if self.processos > 1:
+            return self._decidir_paralelo(game, me_idx, legal_moves, contadores)
+        root = self._raiz(game, me_idx)
+        visitas_reaproveitadas = root.visits
+        it, jogadas, nos_novos = self._buscar(game, me_idx, root,
+                                              Orcamento(self.tempo_limite, self.limite_nos))
 
-        # map moves to child nodes
-        move_nodes = {i: MCTSAgent.Node(parent=root, move=legal_moves[i]) for i in range(len(legal_moves))}
-        root.children = list(move_nodes.values())
+        # choose child with max average value
+        best_child = None
+        best_avg = -float("inf")
+        for child in root.children:
+            avg = child.value / child.visits
+            if avg > best_avg:
+                best_avg = avg
+                best_child = child
+        self._arvore = best_child
+
+        if contadores is not None:
+            contadores.update(opcoes=len(legal_moves), iteracoes=it,
+                              rollouts=it, jogadas_simuladas=jogadas, nos_novos=nos_novos,
+                              visitas_reaproveitadas=visitas_reaproveitadas)
+        return para_escolha(best_child.move)
+
+    def _decidir_paralelo(self, game, me_idx, legal_moves, contadores):
+        """
+        Root parallelization: cada processo do pool roda uma busca independente a partir do
+        mesmo estado (enviado por serializacao.serializar_jogo), com semente própria derivada
+        de self.rng; as visitas e os valores dos filhos da raiz são somados e a jogada é a de
+        maior média. Sem reaproveitamento de árvore entre decisões.
+        """
+        inicio = time.perf_counter()
+        semente = self.rng.getrandbits(64)
+        dados = serializar_jogo(game)
+        tempo = self.tempo_limite
+        if tempo:
+            tempo = max(tempo - (time.perf_counter() - inicio), 1e-3)
+        tarefas = [(dados, me_idx, derivar_semente(semente, "mcts", k), self.iterations,
+                    self.rollout_limit, tempo, self.limite_nos) for k in range(self.processos)]
+        filhos = {}  # jogada -> [visitas, valor], na ordem em que aparecem
+        it = jogadas = nos_novos = 0
+        for parciais, it_k, jogadas_k, nos_k in obter_pool(self.processos).map(_mcts_em_processo, tarefas):
+            for move, visitas, valor in parciais:
+                soma = filhos.setdefault(move, [0, 0.0])
+                soma[0] += visitas
+                soma[1] += valor
+            it += it_k
+            jogadas += jogadas_k
+            nos_novos += nos_k
+        best_move = None
+        best_avg = -float("inf")
+        for move, (visitas, valor) in filhos.items():
+            avg = valor / visitas
+            if avg > best_avg:
+                best_avg = avg
+                best_move = move
+        self._arvore = None
+
+        if contadores is not None:
+            contadores.update(opcoes=len(legal_moves), iteracoes=it,
+                              rollouts=it, jogadas_simuladas=jogadas, nos_novos=nos_novos,
+                              visitas_reaproveitadas=0, processos=self.processos)
+        return para_escolha(best_move)
+
+    def _buscar(self, game, me_idx, root, orcamento, embaralhar=False):
+        """
+        Iterações de MCTS a partir de root (estado atual de game) até iterations ou o fim do
+        orçamento. embaralhar: sorteia (self.rng) a ordem de expansão das jogadas de cada nó,
+        para que buscas paralelas da mesma raiz explorem árvores diferentes.
+        Retorna (iterações, jogadas simuladas, nós criados).
+        """
+        n_jogadores = len(game.jogadores)
 
         def rollout_simulation(g, starting_idx):
-            # play the rest of the round with quick greedy heuristic
-            me_local_idx = me_idx
+            # play the rest of the round with quick greedy heuristic, in place;
+            # returns the round-end score for me_idx and the undo stack
+            pilha = []
             while not g._todas_fontes_vazias():
                 cur = starting_idx % len(g.jogadores)
-                choices = gerar_opcoes_para_jogador(g, cur)
+                choices = listar_movimentos(g, cur)
                 if not choices:
                     starting_idx += 1
                     continue
                 # pick greedy quick
-                bestc = None
-                bestv = -float("inf")
-                for c in choices:
-                    gg = clone_game(g)
-                    aplicar_escolha_simulada(gg, cur, {"fonte": (c[0], c[1]), "cor": c[2], "linha": c[3]})
-                    v = avaliar_jogo_simples(gg, cur)
-                    if v > bestv:
-                        bestv = v
-                        bestc = c
-                aplicar_escolha_simulada(g, cur, {"fonte": (bestc[0], bestc[1]), "cor": bestc[2], "linha": bestc[3]})
+                bestc = escolha_gulosa(g, cur, choices)
+                pilha.append(g.aplicar_movimento(cur, bestc))
                 starting_idx += 1
-            # finalize round and return score for me_idx
-            g.fase_parede_e_pontuacao()
-            return g.jogadores[me_local_idx].pontos
+            return pontos_apos_rodada(g, me_idx), pilha
 
-        # MCTS iterations
-        for it in range(self.iterations):
-            # selection: pick a child at root via UCB
-            # for deeper trees we would walk down; here root->child only because we rebuild tree per decision
-            # choose child with highest UCB
-            total_visits = sum(c.visits for c in root.children) + 1
+        def selecionar(node):
+            # UCB; nos nós dos adversários o termo de aproveitamento troca de sinal
+            sinal = 1.0 if node.jogador == me_idx else -1.0
+            log_total = math.log(node.visits + 1)
             best_child = None
             best_ucb = -float("inf")
-            for child in root.children:
-                if child.visits == 0:
-                    ucb = float("inf")
-                else:
-                    exploit = child.value / child.visits
-                    explore = math.sqrt(2 * math.log(total_visits) / child.visits)
-                    ucb = exploit + 1.41 * explore
+            for child in node.children:
+                exploit = sinal * child.value / child.visits
+                explore = math.sqrt(2 * log_total / child.visits)
+                ucb = exploit + 1.41 * explore
                 if ucb > best_ucb:
                     best_ucb = ucb
                     best_child = child
+            return best_child
 
-            # expansion & simulation
-            move = best_child.move
-            g = clone_game(game)
-            aplicar_escolha_simulada(g, me_idx, {"fonte": (move[0], move[1]), "cor": move[2], "linha": move[3]})
-            next_start = (me_idx + 1) % len(g.jogadores)
+        # MCTS iterations
+        jogadas = 0
+        nos_novos = 0
+        rast = rastreio.ATIVO
+        it = 0
+        while self.iterations is None or it < self.iterations:
+            if it and orcamento.esgotado(jogadas):
+                break
+            it += 1
+            node = root
+            caminho = []
+            # selection / expansion: desce pelos nós já expandidos até criar um filho novo
+            while True:
+                if node.nao_expandidas is None:
+                    node.nao_expandidas = list(reversed(listar_movimentos(game, node.jogador)))
+                    if embaralhar:
+                        self.rng.shuffle(node.nao_expandidas)
+                if node.nao_expandidas:
+                    move = node.nao_expandidas.pop()
+                    caminho.append(game.aplicar_movimento(node.jogador, move))
+                    prox = (node.jogador + 1) % n_jogadores
+                    child = MCTSAgent.Node(node, move, prox, game.hash ^ ZOB_VEZ[prox])
+                    node.children.append(child)
+                    node = child
+                    nos_novos += 1
+                    break
+                if not node.children:
+                    break  # fim da rodada: nó terminal
+                node = selecionar(node)
+                caminho.append(game.aplicar_movimento(node.parent.jogador, node.move))
             # rollout
-            score = rollout_simulation(g, next_start)
+            if rast:
+                rast.abrir("rollout")
+            score, pilha = rollout_simulation(game, node.jogador)
+            if rast:
+                rast.fechar("rollout")
+            jogadas += len(pilha) + len(caminho)
+            for r in reversed(pilha):
+                game.desfazer(r)
+            for r in reversed(caminho):
+                game.desfazer(r)
 
             # backpropagate
-            node = best_child
             while node is not None:
                 node.visits += 1
                 node.value += score
                 node = node.parent
-
-        # choose child with max average value
-        best_i = None
-        best_avg = -float("inf")
-        for i, child in enumerate(root.children):
-            if child.visits == 0:
-                avg = -float("inf")
-            else:
-                avg = child.value / child.visits
-            if avg > best_avg:
-                best_avg = avg
-                best_i = i
-
-        chosen = legal_moves[best_i]
-        fonte = (chosen[0], chosen[1])
-        return {"fonte": fonte, "cor": chosen[2], "linha": chosen[3]}
+        return it, jogadas, nos_novos
+
+def _mcts_em_processo(tarefa):
+    # executado num processo de paralelo.obter_pool (ver MCTSAgent._decidir_paralelo)
+    dados, me_idx, semente, iterations, rollout_limit, tempo, nos = tarefa
+    game = desserializar_jogo(dados)
+    agente = MCTSAgent("mcts", iterations=iterations, rollout_limit=rollout_limit,
+                       rng=random.Random(semente), tempo_limite=tempo, limite_nos=nos,
+                       reaproveitar_arvore=False)
+    root = MCTSAgent.Node(parent=None, move=None, jogador=me_idx, chave=game.hash ^ ZOB_VEZ[me_idx])
+    it, jogadas, nos_novos = agente._buscar(game, me_idx, root, Orcamento(tempo, nos), embaralhar=True)
+    return [(c.move, c.visits, c.value) for c in root.children], it, jogadas, nos_novos
+
+_MINIMAX_PROCESSO = {}  # agente (com a sua TT) reaproveitado entre tarefas, por tamanho de TT
+
+def _minimax_em_processo(tarefa):
+    # executado num processo de paralelo.obter_pool (ver MinimaxAgent._buscar_paralelo)
+    dados, me_idx, opcao, depth, tt_max_entradas = tarefa
+    agente = _MINIMAX_PROCESSO.get(tt_max_entradas)
+    if agente is None:
+        agente = _MINIMAX_PROCESSO[tt_max_entradas] = MinimaxAgent("minimax", tt_max_entradas=tt_max_entradas)
+    agente.depth = depth
+    game = desserializar_jogo(dados)
+    _, valor, estatisticas = agente._buscar(game, me_idx, [opcao])
+    return valor, estatisticas
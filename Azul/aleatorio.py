@@ -0,0 +1,27 @@
+# aleatorio.py
+"""
+Geradores aleatórios independentes por jogo e por agente.
+Cada Jogo/agente recebe o seu random.Random em vez de usar o estado global do módulo
+random; as sementes de cada um são derivadas de uma semente mestra, então partidas
+rodando em paralelo (threads ou processos) continuam reprodutíveis.
+"""
+
+import hashlib
+import random
+
+
+def derivar_semente(semente, *chaves):
+    """
+    Semente de 64 bits reprodutível para o fluxo identificado por (semente, *chaves).
+    Ex.: derivar_semente(42, "partida", 7) -> semente da partida 7 de uma rodada com --seed 42.
+    Não depende de PYTHONHASHSEED nem da ordem em que os fluxos são criados.
+    """
+    dados = repr((semente,) + chaves).encode()
+    return int.from_bytes(hashlib.sha256(dados).digest()[:8], "big")
+
+
+def criar_rng(semente=None, *chaves):
+    """random.Random do fluxo (semente, *chaves); semente None -> entropia do sistema."""
+    if semente is None:
+        return random.Random()
+    return random.Random(derivar_semente(semente, *chaves))
@@ -0,0 +1,142 @@
+# avaliacao.py
+"""
+Teste sequencial (SPRT) para confrontos e ratings Elo entre vários agentes.
+Resultados de partida são sempre do ponto de vista do primeiro agente: 1 vitória,
+0.5 empate, 0 derrota. Elo e placar esperado se convertem pela curva logística usual
+(400 pontos de Elo = chance 10:1).
+"""
+
+import math
+
+
+def placar_de_elo(elo):
+    """Placar esperado (0..1) de quem tem `elo` pontos a mais que o adversário."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def elo_de_placar(placar):
+    """Diferença de Elo correspondente ao placar médio (limitado para não dar infinito)."""
+    placar = min(max(placar, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / placar - 1.0)
+
+
+class SPRT:
+    """
+    Teste sequencial da razão de verossimilhanças entre H0: Elo = elo0 e H1: Elo = elo1,
+    com a aproximação normal do placar (GSPRT, como em cutechess/fishtest).
+    Antes dos dados conta-se uma vitória e uma derrota fictícias, para que uma sequência
+    só de vitórias (variância zero) não decida já na primeira partida.
+    """
+
+    def __init__(self, elo0, elo1, alpha=0.05, beta=0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.s0 = placar_de_elo(elo0)
+        self.s1 = placar_de_elo(elo1)
+        self.limite_inferior = math.log(beta / (1 - alpha))
+        self.limite_superior = math.log((1 - beta) / alpha)
+        self.contagem = {1.0: 1, 0.5: 0, 0.0: 1}  # pseudo-contagens (ver docstring)
+
+    def adicionar(self, resultado):
+        self.contagem[resultado] += 1
+
+    @property
+    def llr(self):
+        n = sum(self.contagem.values())
+        s = sum(x * c for x, c in self.contagem.items()) / n
+        var = sum(c * (x - s) ** 2 for x, c in self.contagem.items()) / n
+        return n * (self.s1 - self.s0) * (2 * s - self.s0 - self.s1) / (2 * var)
+
+    def decisao(self):
+        """'H1', 'H0' ou None (continuar jogando)."""
+        llr = self.llr
+        if llr >= self.limite_superior:
+            return "H1"
+        if llr <= self.limite_inferior:
+            return "H0"
+        return None
+
+
+class ConfrontoSequencial:
+    """
+    Dois SPRTs simétricos para um confronto a x b com margem de `elo` pontos:
+    para assim que um agente é significativamente mais forte (Elo >= +elo ou <= -elo)
+    ou quando os dois testes aceitam H0, isto é, a diferença é menor que `elo`.
+    """
+
+    def __init__(self, a, b, elo=50.0, alpha=0.05, beta=0.05):
+        self.a = a
+        self.b = b
+        self.a_melhor = SPRT(0.0, elo, alpha, beta)
+        self.b_melhor = SPRT(0.0, -elo, alpha, beta)
+        self.elo = elo
+
+    def adicionar(self, resultado):
+        self.a_melhor.adicionar(resultado)
+        self.b_melhor.adicionar(resultado)
+
+    def decisao(self):
+        """Texto com o veredito, ou None enquanto o teste não decidiu."""
+        da = self.a_melhor.decisao()
+        db = self.b_melhor.decisao()
+        if da == "H1":
+            return f"{self.a} mais forte (Elo >= +{self.elo:g})"
+        if db == "H1":
+            return f"{self.b} mais forte (Elo >= +{self.elo:g})"
+        if da == "H0" and db == "H0":
+            return f"{self.a} e {self.b} equivalentes (|Elo| < {self.elo:g})"
+        return None
+
+    def resumo(self):
+        return (f"LLR {self.a}: {self.a_melhor.llr:+.2f}  LLR {self.b}: {self.b_melhor.llr:+.2f}  "
+                f"limites [{self.a_melhor.limite_inferior:.2f}, {self.a_melhor.limite_superior:.2f}]")
+
+
+class TabelaRating:
+    """
+    Placar acumulado entre pares de agentes e ratings Elo por máxima verossimilhança
+    (modelo de Bradley-Terry, algoritmo MM). Não depende da ordem das partidas, ao contrário
+    da atualização Elo partida a partida. Cada par recebe um empate fictício para que um
+    agente invicto não tenha rating infinito.
+    """
+
+    def __init__(self, agentes):
+        self.agentes = list(agentes)
+        self.pontos = {(a, b): 0.0 for a in self.agentes for b in self.agentes if a != b}
+        self.jogos = {(a, b): 0 for a in self.agentes for b in self.agentes if a != b}
+
+    def adicionar(self, a, b, resultado):
+        """Partida a x b com `resultado` do ponto de vista de a."""
+        self.pontos[a, b] += resultado
+        self.pontos[b, a] += 1.0 - resultado
+        self.jogos[a, b] += 1
+        self.jogos[b, a] += 1
+
+    def partidas(self, a):
+        return sum(self.jogos[a, b] for b in self.agentes if b != a)
+
+    def ratings(self, iteracoes=200):
+        """{agente: Elo}, com média zero."""
+        agentes = self.agentes
+        forca = {a: 1.0 for a in agentes}
+        pontos = {par: p + 0.5 for par, p in self.pontos.items() if self.jogos[par]}
+        jogos = {par: n + 1 for par, n in self.jogos.items() if n}
+        for _ in range(iteracoes):
+            nova = {}
+            for a in agentes:
+                vitorias = sum(p for (x, _), p in pontos.items() if x == a)
+                denom = sum(n / (forca[a] + forca[b]) for (x, b), n in jogos.items() if x == a)
+                nova[a] = vitorias / denom if denom else forca[a]
+            # normaliza pela média geométrica (Elo médio zero)
+            g = math.exp(sum(math.log(v) for v in nova.values()) / len(nova))
+            forca = {a: v / g for a, v in nova.items()}
+        return {a: 400.0 * math.log10(forca[a]) for a in agentes}
+
+    def tabela(self):
+        linhas = []
+        for a, elo in sorted(self.ratings().items(), key=lambda x: -x[1]):
+            n = self.partidas(a)
+            feitos = sum(self.pontos[a, b] for b in self.agentes if b != a)
+            taxa = f"{feitos / n:.3f}" if n else "-"
+            linhas.append(f"{a:>10}  Elo {elo:+7.1f}  partidas {n:5d}  placar {taxa}")
+        return "\n".join(linhas)
@@ -1,5 +1,4 @@
 from enum import Enum
-import random
 
 class CorAzulejo(Enum):
     AZUL = "B"     # Blue
@@ -8,17 +7,27 @@ class CorAzulejo(Enum):
     PRETO = "K"    # Black
     BRANCO = "W"   # White
 
+    def __init__(self, _valor):
+        # posição da cor em ALL_COLORS (0..4), usada como bit nas máscaras do tabuleiro
+        self.indice = len(type(self)._member_names_)
+
     def __str__(self):
         return self.value
 
 ALL_COLORS = list(CorAzulejo)
+# ordem usada por cores_disponiveis() (alfabética pelo valor: B, K, R, W, Y)
+CORES_POR_VALOR = sorted(ALL_COLORS, key=lambda x: x.value)
+
+def contagem_de_lista(azulejos):
+    """Lista de CorAzulejo -> vetor de 5 contagens indexado por cor.indice."""
+    contagem = [0] * 5
+    for a in azulejos:
+        contagem[a.indice] += 1
+    return contagem
 
-def gerar_todos_azulejos():
-    """
-    Gera 20 azulejos de cada cor (100 total), embaralhados.
-    """
+def lista_de_contagem(contagem):
+    """Vetor de contagens -> lista de CorAzulejo (agrupada na ordem de ALL_COLORS)."""
     azulejos = []
     for cor in ALL_COLORS:
-        azulejos += [cor] * 20
-    random.shuffle(azulejos)
+        azulejos += [cor] * contagem[cor.indice]
     return azulejos
@@ -0,0 +1,9 @@
+# benchmarks/__init__.py
+"""
+Benchmarks de desempenho do motor do Azul.
+Rodar a partir da pasta Azul/, por exemplo:
+    python -m benchmarks.clone
+    python -m benchmarks.micro
+    python -m benchmarks.macro --agentes greedy,mcts
+    python -m benchmarks --json atual.json --baseline base.json
+"""
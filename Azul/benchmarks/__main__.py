@@ -0,0 +1,52 @@
+# benchmarks/__main__.py
+"""
+Roda as suítes de benchmark, salva o resultado em JSON e compara com um baseline.
+Uso (da pasta Azul/):
+    python -m benchmarks --json atual.json
+    python -m benchmarks --baseline base.json --tolerancia 0.15
+Sai com código 1 se alguma métrica piorou mais que a tolerância em relação ao baseline.
+"""
+
+import argparse
+import sys
+from benchmarks import macro, micro
+from benchmarks.medicao import ambiente, carregar_json, comparar, imprimir_comparacao, salvar_json
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--suite", choices=["micro", "macro", "todas"], default="todas")
+    p.add_argument("--repeticoes", type=int, default=200, help="Repetições dos micro-benchmarks")
+    p.add_argument("--agentes", type=str, default=None, help="Tipos do macro-benchmark (padrão: todos)")
+    p.add_argument("--jogos", type=int, default=2, help="Partidas por agente no macro-benchmark")
+    p.add_argument("--sem-memoria", action="store_true")
+    p.add_argument("--json", type=str, default=None, help="Salvar o resultado neste arquivo")
+    p.add_argument("--baseline", type=str, default=None, help="Resultado anterior para comparar")
+    p.add_argument("--tolerancia", type=float, default=0.10,
+                   help="Piora relativa aceita antes de acusar regressão (0.10 = 10%%)")
+    args = p.parse_args()
+
+    resultado = {"ambiente": ambiente(), "suites": {}}
+    if args.suite in ("micro", "todas"):
+        print("== micro ==")
+        resultado["suites"]["micro"] = micro.executar(args.repeticoes)
+        micro.imprimir(resultado["suites"]["micro"])
+    if args.suite in ("macro", "todas"):
+        print("== macro ==")
+        agentes = args.agentes.split(",") if args.agentes else None
+        resultado["suites"]["macro"] = macro.executar(agentes, args.jogos, memoria=not args.sem_memoria)
+        macro.imprimir(resultado["suites"]["macro"])
+    if args.json:
+        salvar_json(resultado, args.json)
+
+    if args.baseline:
+        print(f"== comparação com {args.baseline} ==")
+        regressoes = imprimir_comparacao(comparar(resultado, carregar_json(args.baseline)),
+                                         args.tolerancia)
+        if regressoes:
+            print(f"{regressoes} métrica(s) piorou(aram) mais que {args.tolerancia:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
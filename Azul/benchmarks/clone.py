@@ -0,0 +1,33 @@
+# benchmarks/clone.py
+"""
+Compara copy.deepcopy(jogo) com Jogo.clonar() (usado por ai_agents.clone_game).
+Uso: python -m benchmarks.clone [--repeticoes N]
+"""
+
+import argparse
+import copy
+import timeit
+from benchmarks.posicoes import corpus
+
+
+def medir(func, jogos, repeticoes):
+    """Tempo médio por cópia (segundos), melhor de 3 medições."""
+    melhor = min(timeit.repeat(lambda: [func(j) for j in jogos], number=repeticoes, repeat=3))
+    return melhor / (repeticoes * len(jogos))
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--repeticoes", type=int, default=200)
+    args = p.parse_args()
+
+    jogos = corpus()
+    t_deep = medir(copy.deepcopy, jogos, args.repeticoes)
+    t_clone = medir(lambda j: j.clonar(), jogos, args.repeticoes)
+    print(f"copy.deepcopy : {t_deep * 1e6:8.1f} us/cópia")
+    print(f"Jogo.clonar   : {t_clone * 1e6:8.1f} us/cópia")
+    print(f"speedup       : {t_deep / t_clone:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/macro.py
+"""
+Macro-benchmark: partidas completas (agente contra ele mesmo) para cada tipo de
+simulador.AGENTS_MAP, com decisões por segundo, percentis da latência por decisão
+e pico de memória (tracemalloc, numa partida extra para não distorcer os tempos).
+Uso: python -m benchmarks.macro [--agentes greedy,mcts] [--jogos N] [--json saida.json]
+"""
+
+import argparse
+import time
+import tracemalloc
+from benchmarks.medicao import ambiente, percentil, salvar_json
+from instrumentacao import ColetorDecisoes
+from simulador import AGENTS_MAP, run_single_game, semente_partida
+
+
+def medir_agente(nome_tipo, jogos=2, seed=0, memoria=True):
+    # latências vindas do gancho de instrumentação dos jogadores (instrumentacao.py)
+    coletor = ColetorDecisoes()
+    inicio = time.perf_counter()
+    for i in range(jogos):
+        run_single_game([nome_tipo, nome_tipo], seed=semente_partida(seed, i), instrumentacao=coletor)
+    total = time.perf_counter() - inicio
+    latencias = [d["tempo_ms"] / 1e3 for d in coletor.registros()]
+
+    resultado = {"partidas": jogos, "decisoes": len(latencias), "s_por_partida": total / jogos,
+                 "decisoes_por_s": len(latencias) / sum(latencias) if latencias else 0.0}
+    ordenadas = sorted(latencias)
+    for p in (50, 90, 99):
+        resultado[f"ms_p{p}"] = percentil(ordenadas, p) * 1e3
+    resultado["ms_max"] = ordenadas[-1] * 1e3 if ordenadas else 0.0
+
+    if memoria:
+        tracemalloc.start()
+        try:
+            run_single_game([nome_tipo, nome_tipo], seed=semente_partida(seed, jogos))
+            resultado["pico_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return resultado
+
+
+def executar(agentes=None, jogos=2, seed=0, memoria=True):
+    agentes = agentes or list(AGENTS_MAP)
+    return {nome: medir_agente(nome, jogos, seed, memoria) for nome in agentes}
+
+
+def imprimir(resultados):
+    for nome, r in resultados.items():
+        pico = f"  pico {r['pico_kb']:9.0f} KB" if "pico_kb" in r else ""
+        print(f"{nome:<8} {r['s_por_partida']:8.2f} s/partida  {r['decisoes_por_s']:9.1f} decisões/s  "
+              f"p50 {r['ms_p50']:8.2f} ms  p90 {r['ms_p90']:8.2f} ms  p99 {r['ms_p99']:8.2f} ms{pico}")
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--agentes", type=str, default=None, help="Tipos separados por vírgula (padrão: todos)")
+    p.add_argument("--jogos", type=int, default=2)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--sem-memoria", action="store_true", help="Não medir o pico de memória")
+    p.add_argument("--json", type=str, default=None)
+    args = p.parse_args()
+    agentes = args.agentes.split(",") if args.agentes else None
+    resultados = executar(agentes, args.jogos, args.seed, not args.sem_memoria)
+    imprimir(resultados)
+    if args.json:
+        salvar_json({"ambiente": ambiente(), "suites": {"macro": resultados}}, args.json)
+
+
+if __name__ == "__main__":
+    main()
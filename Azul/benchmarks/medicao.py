@@ -0,0 +1,96 @@
+# benchmarks/medicao.py
+"""
+Utilitários comuns dos benchmarks: cronometragem, percentis, gravação em JSON e
+comparação com um baseline salvo.
+"""
+
+import json
+import platform
+import sys
+import time
+import timeit
+
+# métricas em que um valor maior é pior; só elas entram na comparação com o baseline
+MENOR_MELHOR = ("us_por_op", "ms_p50", "ms_p90", "ms_p99", "s_por_partida", "pico_kb")
+
+
+def medir(func, repeticoes, repeat=3):
+    """Tempo médio (segundos) de uma chamada de func(), melhor de `repeat` medições."""
+    return min(timeit.repeat(func, number=repeticoes, repeat=repeat)) / repeticoes
+
+
+def medir_lote(preparar, func, repeat=3):
+    """
+    Para operações que alteram o objeto (ex.: finalizar_rodada): preparar() gera uma lista
+    de argumentos novos fora da cronometragem e só as chamadas func(arg) são medidas.
+    Retorna o tempo médio por chamada (segundos), melhor de `repeat` lotes.
+    """
+    melhor = None
+    for _ in range(repeat):
+        args = preparar()
+        inicio = time.perf_counter()
+        for a in args:
+            func(a)
+        t = (time.perf_counter() - inicio) / len(args)
+        melhor = t if melhor is None else min(melhor, t)
+    return melhor
+
+
+def percentil(valores_ordenados, p):
+    """Percentil p (0..100) por interpolação linear numa lista já ordenada."""
+    if not valores_ordenados:
+        return 0.0
+    pos = (len(valores_ordenados) - 1) * p / 100
+    i = int(pos)
+    j = min(i + 1, len(valores_ordenados) - 1)
+    return valores_ordenados[i] + (valores_ordenados[j] - valores_ordenados[i]) * (pos - i)
+
+
+def ambiente():
+    return {"python": sys.version.split()[0], "implementacao": platform.python_implementation(),
+            "maquina": platform.machine(), "sistema": platform.system()}
+
+
+def salvar_json(resultado, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def carregar_json(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparar(atual, baseline):
+    """
+    Compara as métricas MENOR_MELHOR de cada benchmark presente nos dois resultados.
+    Retorna uma lista de (benchmark, métrica, valor_baseline, valor_atual, razão) ordenada
+    por benchmark (a tolerância é aplicada em imprimir_comparacao).
+    """
+    linhas = []
+    for suite, medidas in atual.get("suites", {}).items():
+        base_suite = baseline.get("suites", {}).get(suite, {})
+        for nome, metricas in medidas.items():
+            base = base_suite.get(nome)
+            if not base:
+                continue
+            for m in MENOR_MELHOR:
+                if m in metricas and base.get(m):
+                    linhas.append((f"{suite}/{nome}", m, base[m], metricas[m], metricas[m] / base[m]))
+    return linhas
+
+
+def imprimir_comparacao(linhas, tolerancia=0.10):
+    """Imprime a tabela de comparação e retorna quantas métricas regrediram."""
+    regressoes = 0
+    for nome, m, base, atual, razao in linhas:
+        if razao > 1 + tolerancia:
+            marca = "REGRESSÃO"
+            regressoes += 1
+        elif razao < 1 - tolerancia:
+            marca = "melhora"
+        else:
+            marca = ""
+        print(f"{nome:<45} {m:<14} {base:12.3f} -> {atual:12.3f}  x{razao:5.2f}  {marca}")
+    return regressoes
@@ -0,0 +1,78 @@
+# benchmarks/micro.py
+"""
+Micro-benchmarks das primitivas quentes do motor e dos agentes, sobre o corpus fixo
+de posições (benchmarks.posicoes).
+Uso: python -m benchmarks.micro [--repeticoes N] [--json saida.json]
+"""
+
+import argparse
+import random
+from ai_agents import (avaliar_jogo_simples, clone_game, escolha_gulosa, gerar_opcoes_para_jogador,
+                       opcao_para_escolha)
+from benchmarks.medicao import ambiente, medir, medir_lote, salvar_json
+from benchmarks.posicoes import corpus
+from movimentos import gerar_movimentos, listar_movimentos
+from saco import Saco
+
+
+def executar(repeticoes=200):
+    """Retorna {nome: {"us_por_op": ..., "ops_por_s": ...}} para cada primitiva."""
+    jogos = corpus()
+    # o jogador da vez não importa para as primitivas; todas as posições têm fontes com peças
+    vezes = [0] * len(jogos)
+    escolhas = [opcao_para_escolha(gerar_opcoes_para_jogador(j, idx)[0]) for j, idx in zip(jogos, vezes)]
+    n = len(jogos)
+
+    def todos(func):
+        return lambda: [func(j, idx) for j, idx in zip(jogos, vezes)]
+
+    tempos = {
+        "clone_game": medir(todos(lambda j, idx: clone_game(j)), repeticoes) / n,
+        # geração de fato: o cache de listar_movimentos não participa
+        "gerar_movimentos": medir(todos(lambda j, idx: tuple(gerar_movimentos(j, idx))), repeticoes) / n,
+        # a partir da 2ª repetição, consulta ao cache de listar_movimentos + conversão para tuplas
+        "gerar_opcoes_para_jogador": medir(todos(gerar_opcoes_para_jogador), repeticoes) / n,
+        "avaliar_jogo_simples": medir(todos(avaliar_jogo_simples), repeticoes) / n,
+        # política dos playouts sobre todas as jogadas da posição (lista vinda do cache)
+        "escolha_gulosa": medir(todos(lambda j, idx: escolha_gulosa(j, idx, listar_movimentos(j, idx))),
+                                repeticoes) / n,
+    }
+
+    # operações que alteram o estado: cópias novas preparadas fora da cronometragem
+    def aplicar(args):
+        jogo, idx, escolha = args
+        jogo._aplicar_escolha(jogo.jogadores[idx], escolha)
+
+    tempos["Jogo._aplicar_escolha"] = medir_lote(
+        lambda: [(j.clonar(), idx, e) for _ in range(repeticoes)
+                 for j, idx, e in zip(jogos, vezes, escolhas)],
+        aplicar)
+    tempos["Tabuleiro.finalizar_rodada"] = medir_lote(
+        lambda: [jog.tabuleiro.clonar() for _ in range(repeticoes) for j in jogos for jog in j.jogadores],
+        lambda tab: tab.finalizar_rodada())
+    # sacos novos com gerador próprio: um clone sortearia com cópia do gerador (ver Saco.clonar)
+    tempos["Saco.puxar(4)"] = medir_lote(
+        lambda: [Saco(rng=random.Random(k)) for k in range(repeticoes * n)],
+        lambda saco: saco.puxar(4))
+
+    return {nome: {"us_por_op": t * 1e6, "ops_por_s": 1.0 / t} for nome, t in tempos.items()}
+
+
+def imprimir(resultados):
+    for nome, r in resultados.items():
+        print(f"{nome:<28} {r['us_por_op']:10.2f} us/op  {r['ops_por_s']:12.0f} ops/s")
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--repeticoes", type=int, default=200)
+    p.add_argument("--json", type=str, default=None)
+    args = p.parse_args()
+    resultados = executar(args.repeticoes)
+    imprimir(resultados)
+    if args.json:
+        salvar_json({"ambiente": ambiente(), "suites": {"micro": resultados}}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/posicoes.py
+"""
+Corpus fixo de posições para os benchmarks: partidas semeadas avançadas até o meio
+de uma rodada com a heurística padrão (Jogador._escolha_cpu).
+"""
+
+from jogo import Jogo
+from jogador import Jogador
+from ai_agents import GreedyAgent, MCTSAgent
+
+
+def gerar_posicao(seed, rodadas=2, jogadas=3):
+    """
+    Retorna um Jogo com `rodadas` rodadas completas jogadas e `jogadas` escolhas
+    já feitas na rodada atual. Os jogadores são agentes de IA, como nas partidas reais.
+    """
+    jogadores = [GreedyAgent("GREEDY_1"), MCTSAgent("MCTS_2")]
+    jogo = Jogo(jogadores, seed=seed)
+    jogo.preparar_rodada()
+    for r in range(rodadas + 1):
+        limite = jogadas if r == rodadas else None
+        feitas = 0
+        idx = 0
+        while not jogo._todas_fontes_vazias() and (limite is None or feitas < limite):
+            jogador = jogo.jogadores[idx % len(jogo.jogadores)]
+            estado = {
+                "expositores": jogo.expositores,
+                "centro": jogo.centro,
+                "jogadores": jogo.jogadores,
+                "indice_jogador": idx % len(jogo.jogadores),
+                "all_colors": jogo.all_colors,
+            }
+            escolha = Jogador._escolha_cpu(jogador, estado)
+            if escolha is not None:
+                jogo._aplicar_escolha(jogador, escolha)
+            idx += 1
+            feitas += 1
+        if r < rodadas:
+            jogo.fase_parede_e_pontuacao()
+            jogo.preparar_rodada()
+    return jogo
+
+
+def corpus(n=8, seed=0):
+    return [gerar_posicao(seed + i) for i in range(n)]
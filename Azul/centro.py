@@ -1,41 +1,71 @@
 # centro_da_mesa.py
+from azulejos import ALL_COLORS, CORES_POR_VALOR, contagem_de_lista, lista_de_contagem
+
 class CentroMesa:
     def __init__(self):
-        self.azulejos = []
+        self.contagem = [0] * len(ALL_COLORS)  # quantidade de azulejos por cor.indice
+        self.total = 0
         self.token_primeiro = True  # token do primeiro jogador disponível no início
 
+    @property
+    def azulejos(self):
+        """Visão (somente leitura) dos azulejos do centro, para a interface."""
+        return lista_de_contagem(self.contagem)
+
+    def clonar(self):
+        novo = CentroMesa.__new__(CentroMesa)
+        novo.contagem = self.contagem[:]
+        novo.total = self.total
+        novo.token_primeiro = self.token_primeiro
+        return novo
+
     def adicionar(self, itens):
-        self.azulejos += itens
+        self.adicionar_contagem(contagem_de_lista(itens))
+
+    def adicionar_contagem(self, contagem):
+        for k in range(len(contagem)):
+            self.contagem[k] += contagem[k]
+        self.total += sum(contagem)
 
     def vazio(self):
-        return len(self.azulejos) == 0 and not self.token_primeiro
+        return self.total == 0 and not self.token_primeiro
 
-    def retirar_cor(self, cor):
+    def quantidade(self, cor):
+        return self.contagem[cor.indice]
+
+    def retirar(self, cor_idx):
         """
-        Retira todos azulejos da cor escolhida do centro e retorna (selecionados, took_token)
+        Retira todos azulejos da cor de índice cor_idx e retorna (quantidade, took_token).
         took_token = True se o jogador pegar o token primeiro (se token estava presente).
         """
-        selecionados = [a for a in self.azulejos if a == cor]
-        self.azulejos = [a for a in self.azulejos if a != cor]
+        n = self.contagem[cor_idx]
+        self.contagem[cor_idx] = 0
+        self.total -= n
         took_token = False
         if self.token_primeiro:
             # ao retirar do centro, o jogador pega o token (se ainda estava lá)
             self.token_primeiro = False
             took_token = True
-        return selecionados, took_token
+        return n, took_token
+
+    def retirar_cor(self, cor):
+        """
+        Retira todos azulejos da cor escolhida do centro e retorna (selecionados, took_token)
+        took_token = True se o jogador pegar o token primeiro (se token estava presente).
+        """
+        n, took_token = self.retirar(cor.indice)
+        return [cor] * n, took_token
 
     def cores_disponiveis(self):
-        return sorted(set(self.azulejos), key=lambda x: x.value)
+        return [c for c in CORES_POR_VALOR if self.contagem[c.indice]]
 
     def __str__(self):
         s = ""
         if self.token_primeiro:
             s += "[Token Primeiro] "
-        if self.azulejos:
-            counts = {}
-            for a in self.azulejos:
-                counts[a] = counts.get(a, 0) + 1
-            s += ", ".join(f"{c.name}:{counts[c]}" for c in sorted(counts, key=lambda x: x.name))
+        if self.total:
+            s += ", ".join(f"{c.name}:{self.contagem[c.indice]}"
+                           for c in sorted(ALL_COLORS, key=lambda x: x.name) if self.contagem[c.indice])
         else:
             s += "(vazio)"
         return f"Centro: {s}"
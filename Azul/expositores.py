@@ -1,33 +1,68 @@
 # expositores.py
+from azulejos import ALL_COLORS, CORES_POR_VALOR, lista_de_contagem
+
+# contagem de um expositor vazio; as contagens dos expositores são tuplas e nunca
+# mudam no lugar (só são substituídas), então podem ser compartilhadas entre cópias
+CONTAGEM_VAZIA = (0,) * len(ALL_COLORS)
+
 class Expositor:
     def __init__(self, id_):
         self.id = id_
-        self.azulejos = []
+        self.contagem = CONTAGEM_VAZIA  # quantidade de azulejos por cor.indice
+        self.total = 0
+
+    @property
+    def azulejos(self):
+        """Visão (somente leitura) dos azulejos do expositor, para a interface."""
+        return lista_de_contagem(self.contagem)
+
+    def clonar(self):
+        novo = Expositor.__new__(Expositor)
+        novo.id = self.id
+        novo.contagem = self.contagem
+        novo.total = self.total
+        return novo
 
     def preencher(self, saco):
-        self.azulejos = saco.puxar(4)
+        self.receber(saco.puxar_rodada(1)[0])
+
+    def receber(self, contagem):
+        """Define o conteúdo do expositor a partir de uma tupla de contagens (ver Saco.puxar_rodada)."""
+        self.contagem = contagem
+        self.total = sum(contagem)
 
     def vazio(self):
-        return len(self.azulejos) == 0
+        return self.total == 0
+
+    def quantidade(self, cor):
+        return self.contagem[cor.indice]
+
+    def retirar(self, cor_idx):
+        """
+        Remove todos os azulejos da cor de índice cor_idx e retorna (quantidade, contagem_resto).
+        Expositor fica vazio após a retirada.
+        """
+        resto = list(self.contagem)
+        n = resto[cor_idx]
+        resto[cor_idx] = 0
+        self.contagem = CONTAGEM_VAZIA
+        self.total = 0
+        return n, resto
 
     def retirar_cor(self, cor):
         """
         Remove todos os azulejos da cor escolhida e retorna (escolhidos, resto).
         Expositor fica vazio após a retirada.
         """
-        escolhidos = [a for a in self.azulejos if a == cor]
-        resto = [a for a in self.azulejos if a != cor]
-        self.azulejos = []
-        return escolhidos, resto
+        n, resto = self.retirar(cor.indice)
+        return [cor] * n, lista_de_contagem(resto)
 
     def cores_disponiveis(self):
-        return sorted(set(self.azulejos), key=lambda x: x.value)
+        return [c for c in CORES_POR_VALOR if self.contagem[c.indice]]
 
     def __str__(self):
         if self.vazio():
             return f"Expositor {self.id}: (vazio)"
-        counts = {}
-        for a in self.azulejos:
-            counts[a] = counts.get(a, 0) + 1
-        s = ", ".join(f"{c.name}:{counts[c]}" for c in sorted(counts, key=lambda x: x.name))
+        s = ", ".join(f"{c.name}:{self.contagem[c.indice]}"
+                      for c in sorted(ALL_COLORS, key=lambda x: x.name) if self.contagem[c.indice])
         return f"Expositor {self.id}: {s}"
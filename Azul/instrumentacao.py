@@ -0,0 +1,73 @@
+# instrumentacao.py
+"""
+Instrumentação por decisão dos jogadores/agentes.
+Jogador.escolher_jogada chama `instrumentacao.registrar(...)` ao fim de cada decisão quando
+o atributo `instrumentacao` do jogador não é None (padrão: desligado, custo de um teste).
+Os agentes preenchem contadores próprios (rollouts, nós, cortes, ...) no dict `contadores`.
+Qualquer objeto com o método registrar serve de gancho; ColetorDecisoes é o padrão.
+"""
+
+import math
+from bisect import bisect_left
+
+# limites (ms) das faixas do histograma de latência, na série 1-2-5
+FAIXAS_MS = [m * 10.0 ** e for e in range(-2, 5) for m in (1, 2, 5)]
+
+
+class ColetorDecisoes:
+    """Guarda um registro (dict) por decisão; registros() devolve e esvazia a lista."""
+
+    def __init__(self):
+        self._registros = []
+
+    def registrar(self, jogador, estado, escolha, tempo_s, contadores):
+        registro = {"jogador": jogador.nome, "assento": estado.get("indice_jogador"),
+                    "classe": type(jogador).__name__, "tempo_ms": round(tempo_s * 1e3, 4),
+                    "passou": escolha is None}
+        registro.update(contadores)
+        self._registros.append(registro)
+
+    def registros(self):
+        registros, self._registros = self._registros, []
+        return registros
+
+
+class HistogramaLatencia:
+    """Histograma de latências em faixas fixas (FAIXAS_MS): memória constante."""
+
+    def __init__(self):
+        self.contagem = [0] * (len(FAIXAS_MS) + 1)
+        self.n = 0
+        self.soma_ms = 0.0
+        self.max_ms = 0.0
+
+    def adicionar(self, ms):
+        self.contagem[bisect_left(FAIXAS_MS, ms)] += 1
+        self.n += 1
+        self.soma_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentil(self, p):
+        """Limite superior da faixa que contém o percentil p (aproximação pelo histograma)."""
+        alvo = math.ceil(self.n * p / 100)
+        acumulado = 0
+        for i, c in enumerate(self.contagem):
+            acumulado += c
+            if c and acumulado >= alvo:
+                return FAIXAS_MS[i] if i < len(FAIXAS_MS) else self.max_ms
+        return 0.0
+
+    def texto(self, largura=40):
+        if not self.n:
+            return "  (sem decisões)"
+        linhas = [f"  n={self.n} média={self.soma_ms / self.n:.2f} ms "
+                  f"p50<={self.percentil(50):g} p90<={self.percentil(90):g} "
+                  f"p99<={self.percentil(99):g} max={self.max_ms:.2f} ms"]
+        maior = max(self.contagem)
+        for i, c in enumerate(self.contagem):
+            if not c:
+                continue
+            faixa = f"<= {FAIXAS_MS[i]:g} ms" if i < len(FAIXAS_MS) else f"> {FAIXAS_MS[-1]:g} ms"
+            barra = "#" * max(1, round(largura * c / maior))
+            linhas.append(f"  {faixa:>12} {c:7d} {barra}")
+        return "\n".join(linhas)
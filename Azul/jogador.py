@@ -1,20 +1,81 @@
 # jogador.py
 from tabuleiro import Tabuleiro
+import copy
 import random
+import time
 from azulejos import CorAzulejo
 import interface as view  # para renderizar assistência ao jogador (entrada/mostra)
+import rastreio
 
 class Jogador:
-    def __init__(self, nome, tipo="human"):
+    # gancho de instrumentação (ver instrumentacao.py); None = desligado
+    instrumentacao = None
+
+    def __init__(self, nome, tipo="human", rng=None):
         self.nome = nome
         self.tabuleiro = Tabuleiro()
         self.pontos = 0
         self.tipo = tipo  # "human" ou "cpu"
+        # gerador próprio do jogador/agente (injetável, ver aleatorio.criar_rng)
+        self.rng = rng if rng is not None else random.Random()
+
+    @property
+    def rng(self):
+        if self._rng_compartilhado:
+            # gerador compartilhado com um clone (ou com o original): não avançar o do outro
+            self._rng = copy.copy(self._rng)
+            self._rng_compartilhado = False
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+        self._rng_compartilhado = False
+
+    def clonar(self):
+        """
+        Cópia para simulação: o tabuleiro é duplicado; nome, tipo e parâmetros do agente são
+        compartilhados com o original. O estado de busca do agente começa vazio no clone
+        (_limpar_busca) e o gerador, como em Saco.clonar, só é copiado quando um dos dois
+        sorteia, de modo que decidir no clone não altera o original nem o seu fluxo aleatório.
+        """
+        novo = object.__new__(type(self))
+        novo.__dict__.update(self.__dict__)
+        novo.tabuleiro = self.tabuleiro.clonar()
+        novo._rng_compartilhado = self._rng_compartilhado = True
+        novo._limpar_busca()
+        return novo
+
+    def _limpar_busca(self):
+        """Descarta o estado guardado entre decisões (tabelas, árvores); os agentes sobrescrevem."""
 
     def escolher_jogada(self, estado):
         """
         estado: dict com {expositores, centro, jogadores, indice_jogador, all_colors}
         Retorna: {"fonte": ("expositor", idx) or ("centro", None), "cor": CorAzulejo, "linha": 0..4 or -1 for piso}
+        Os agentes (ai_agents.py) sobrescrevem _decidir; com self.instrumentacao ligado,
+        cada decisão é cronometrada e repassada ao gancho com os contadores do agente.
+        Com o rastreio ligado (rastreio.py), a decisão vira um trecho "decisao".
+        """
+        instrumentacao = self.instrumentacao
+        rast = rastreio.ATIVO
+        if instrumentacao is None and rast is None:
+            return self._decidir(estado, None)
+        if rast:
+            rast.abrir("decisao", jogador=self.nome)
+        contadores = {} if instrumentacao is not None else None
+        inicio = time.perf_counter()
+        escolha = self._decidir(estado, contadores)
+        if instrumentacao is not None:
+            instrumentacao.registrar(self, estado, escolha, time.perf_counter() - inicio, contadores)
+        if rast:
+            rast.fechar("decisao")
+        return escolha
+
+    def _decidir(self, estado, contadores):
+        """
+        Escolha propriamente dita. contadores: None (instrumentação desligada) ou dict
+        que o agente preenche com as suas estatísticas da decisão.
         """
         if self.tipo == "cpu":
             return self._escolha_cpu(estado)
@@ -31,15 +92,13 @@ class Jogador:
             if not e.vazio():
                 cores = e.cores_disponiveis()
                 for cor in cores:
-                    escolhidos = [a for a in e.azulejos if a == cor]
-                    opções.append(("expositor", i, cor, len(escolhidos)))
+                    opções.append(("expositor", i, cor, e.contagem[cor.indice]))
         # centro
         centro = estado["centro"]
-        if centro.azulejos or centro.token_primeiro:
+        if centro.total or centro.token_primeiro:
             cores = centro.cores_disponiveis()
             for cor in cores:
-                cnt = sum(1 for a in centro.azulejos if a == cor)
-                opções.append(("centro", None, cor, cnt))
+                opções.append(("centro", None, cor, centro.contagem[cor.indice]))
         # escolher melhor por quantidade
         if not opções:
             return None
@@ -48,9 +107,9 @@ class Jogador:
         # escolher linha que aceite a cor preferencialmente que esteja parcialmente preenchida
         linhas_validas = [i for i in range(5) if self.tabuleiro.pode_colocar_na_linha(i, cor)]
         # priorizar linha que já tenha peças (para completar)
-        linhas_com_pecas = [i for i in linhas_validas if len(self.tabuleiro.linhas[i])>0]
+        linhas_com_pecas = [i for i in linhas_validas if self.tabuleiro.linha_qtd[i]>0]
         if linhas_com_pecas:
-            linha = max(linhas_com_pecas, key=lambda x: len(self.tabuleiro.linhas[x]))
+            linha = max(linhas_com_pecas, key=lambda x: self.tabuleiro.linha_qtd[x])
         elif linhas_validas:
             linha = min(linhas_validas)  # escolher a menor linha disponível
         else:
@@ -73,7 +132,7 @@ class Jogador:
                         break
                 print("Expositor inválido.")
             elif raw in ("centro", "c"):
-                if estado["centro"].azulejos or estado["centro"].token_primeiro:
+                if estado["centro"].total or estado["centro"].token_primeiro:
                     fonte = ("centro", None)
                     break
                 print("Centro vazio.")
@@ -4,15 +4,21 @@ from centro import CentroMesa
 from saco import Saco
 from jogador import Jogador
 from azulejos import ALL_COLORS
+from movimentos import FONTE_CENTRO
+from aleatorio import criar_rng
+import rastreio
+from zobrist import hash_jogo, hash_expositor, hash_linha, ZOB_CENTRO, ZOB_TOKEN_CENTRO, ZOB_DONO_TOKEN, ZOB_PISO
 import interface as view
 
 class Jogo:
-    def __init__(self, jogadores):
+    def __init__(self, jogadores, seed=None, rng=None):
         """
         jogadores: lista de Jogador (instâncias já criadas)
+        seed/rng: gerador do jogo (sorteios do saco). rng tem prioridade; sem nenhum dos dois
+        o jogo usa entropia do sistema. Não usa o estado global do módulo random.
         """
         self.jogadores = jogadores
-        self.saco = Saco()
+        self.saco = Saco(rng=rng if rng is not None else criar_rng(seed))
         self.centro = CentroMesa()
         self.expositores = []
         self.num_expositores = 5 if len(self.jogadores) == 2 else 7
@@ -20,48 +26,144 @@ class Jogo:
         self.all_colors = ALL_COLORS
         # quem tem token primeiro (index); None até token ser pego (we'll store owner after first token pick)
         self.owner_first_token = None
+        # hash Zobrist do estado (zobrist.py), mantido incrementalmente por aplicar/desfazer
+        self.hash = hash_jogo(self)
+
+    @property
+    def rng(self):
+        """Gerador do jogo (o saco é o único consumidor de aleatoriedade)."""
+        return self.saco.rng
+
+    def clonar(self):
+        """
+        Snapshot independente do estado do jogo para as simulações dos agentes.
+        Copia apenas os dados mutáveis (tabuleiros, pontos, saco, expositores, centro).
+        """
+        novo = Jogo.__new__(Jogo)
+        novo.jogadores = [j.clonar() for j in self.jogadores]
+        novo.saco = self.saco.clonar()
+        novo.centro = self.centro.clonar()
+        novo.expositores = [e.clonar() for e in self.expositores]
+        novo.num_expositores = self.num_expositores
+        novo.rodada = self.rodada
+        novo.all_colors = self.all_colors
+        novo.owner_first_token = None
+        if self.owner_first_token is not None:
+            novo.owner_first_token = novo.jogadores[self.jogadores.index(self.owner_first_token)]
+        novo.hash = self.hash
+        return novo
 
     def preparar_rodada(self):
+        rast = rastreio.ATIVO
+        if rast:
+            rast.abrir("preparar_rodada", rodada=self.rodada + 1)
         self.rodada += 1
         self.centro = CentroMesa()
         self.expositores = [Expositor(i+1) for i in range(self.num_expositores)]
-        for e in self.expositores:
-            e.preencher(self.saco)
+        # sorteio de todos os expositores numa chamada só
+        for e, contagem in zip(self.expositores, self.saco.puxar_rodada(self.num_expositores)):
+            e.receber(contagem)
+        self.hash = hash_jogo(self)
+        if rast:
+            rast.fechar("preparar_rodada")
 
     def _todas_fontes_vazias(self):
         ex_vazios = all(e.vazio() for e in self.expositores)
-        centro_vazio = (not self.centro.azulejos) and (not self.centro.token_primeiro)
+        centro_vazio = (not self.centro.total) and (not self.centro.token_primeiro)
         return ex_vazios and centro_vazio
 
     def _aplicar_escolha(self, jogador, escolha):
+        self.aplicar(self.jogadores.index(jogador), escolha)
+
+    def aplicar(self, jogador_idx, escolha):
+        """
+        Aplica a escolha do jogador jogador_idx (mesmo formato de escolher_jogada)
+        e retorna um registro que desfazer() usa para voltar exatamente ao estado anterior.
+        """
         fonte = escolha["fonte"]
-        cor = escolha["cor"]
-        linha = escolha["linha"]
-        escolhidos = []
+        f = fonte[1] + 1 if fonte[0] == "expositor" else FONTE_CENTRO
+        return self._aplicar(jogador_idx, f, escolha["cor"].indice, escolha["linha"])
+
+    def aplicar_movimento(self, jogador_idx, jogada):
+        """Como aplicar(), mas com a jogada codificada em inteiro (ver movimentos.py)."""
+        return self._aplicar(jogador_idx, jogada >> 6, (jogada >> 3) & 7, (jogada & 7) - 1)
+
+    def _aplicar(self, jogador_idx, f, k, linha):
+        # f: 0 = centro, f + 1 = expositor f (codificação de movimentos.py)
+        cor = ALL_COLORS[k]
+        tabuleiro = self.jogadores[jogador_idx].tabuleiro
+        centro = self.centro
         took_token = False
+        token_antes = centro.token_primeiro
+        owner_antes = self.owner_first_token
+        hash_antes = h = self.hash
 
-        if fonte[0] == "expositor":
-            idx = fonte[1]
-            escolhidos, resto = self.expositores[idx].retirar_cor(cor)
+        if f != FONTE_CENTRO:
+            expositor = self.expositores[f - 1]
+            contagem_antes = expositor.contagem
+            h ^= hash_expositor(f - 1, contagem_antes)  # expositor fica vazio (hash 0)
+            qtd, resto = expositor.retirar(k)
             # restos vão para o centro
-            if resto:
-                self.centro.adicionar(resto)
+            for c in range(len(resto)):
+                if resto[c]:
+                    h ^= ZOB_CENTRO[c][centro.contagem[c]] ^ ZOB_CENTRO[c][centro.contagem[c] + resto[c]]
+            centro.adicionar_contagem(resto)
         else:
-            escolhidos, took_token = self.centro.retirar_cor(cor)
+            contagem_antes = resto = None
+            h ^= ZOB_CENTRO[k][centro.contagem[k]]
+            qtd, took_token = centro.retirar(k)
             if took_token:
+                h ^= ZOB_TOKEN_CENTRO
                 # marca que este jogador pegou o token (owner_first_token)
                 if self.owner_first_token is None:
-                    self.owner_first_token = jogador
+                    self.owner_first_token = self.jogadores[jogador_idx]
+                    h ^= ZOB_DONO_TOKEN[jogador_idx]
+
+        # o que a jogada alterou: a fonte, o centro, o token, a linha escolhida e o piso (só cresce)
+        linha_cor = tabuleiro.linha_cor[linha] if linha >= 0 else None
+        linha_qtd = tabuleiro.linha_qtd[linha] if linha >= 0 else 0
+        len_piso = len(tabuleiro.piso)
+        registro = (jogador_idx, f, k, qtd, contagem_antes, resto, token_antes, owner_antes,
+                    linha, linha_cor, linha_qtd, len_piso, hash_antes)
 
         # aplicar azulejos ao tabuleiro
         if linha == -1:
-            jogador.tabuleiro.piso += escolhidos
+            tabuleiro.piso += [cor] * qtd
         else:
-            jogador.tabuleiro.adicionar_a_linha(linha, escolhidos, to_floor_if_excess=True)
+            tabuleiro.adicionar_qtd(linha, cor, qtd, to_floor_if_excess=True)
+            h ^= (hash_linha(jogador_idx, linha, linha_cor, linha_qtd)
+                  ^ hash_linha(jogador_idx, linha, cor, tabuleiro.linha_qtd[linha]))
 
         # se tomou o token, adicionar marcador no piso
         if took_token:
-            jogador.tabuleiro.piso.append("TOKEN")
+            tabuleiro.piso.append("TOKEN")
+        h ^= ZOB_PISO[jogador_idx][len_piso] ^ ZOB_PISO[jogador_idx][len(tabuleiro.piso)]
+        self.hash = h
+        return registro
+
+    def desfazer(self, registro):
+        """Desfaz a jogada de aplicar() (as jogadas devem ser desfeitas em ordem inversa)."""
+        (jogador_idx, f, k, qtd, contagem_antes, resto, token_antes, owner_antes,
+         linha, linha_cor, linha_qtd, len_piso, hash_antes) = registro
+        centro = self.centro
+        if f != FONTE_CENTRO:
+            # contagens dos expositores nunca mudam no lugar: basta devolver a antiga
+            expositor = self.expositores[f - 1]
+            expositor.contagem = contagem_antes
+            expositor.total = sum(contagem_antes)
+            for c in range(len(resto)):
+                centro.contagem[c] -= resto[c]
+            centro.total -= expositor.total - qtd
+        else:
+            centro.contagem[k] += qtd
+            centro.total += qtd
+        centro.token_primeiro = token_antes
+        self.owner_first_token = owner_antes
+        tabuleiro = self.jogadores[jogador_idx].tabuleiro
+        if linha >= 0:
+            tabuleiro.restaurar_linha(linha, linha_cor, linha_qtd)
+        del tabuleiro.piso[len_piso:]
+        self.hash = hash_antes
 
     def fase_coleta(self):
         # ordem de jogo: começa pelo jogador que tem o token (owner_first_token) se definido,
@@ -74,6 +176,9 @@ class Jogo:
             except ValueError:
                 start_idx = 0
 
+        rast = rastreio.ATIVO
+        if rast:
+            rast.abrir("coleta", rodada=self.rodada)
         turno_offset = 0
         while not self._todas_fontes_vazias():
             jogador = self.jogadores[(start_idx + turno_offset) % len(self.jogadores)]
@@ -91,8 +196,13 @@ class Jogo:
                 continue
             self._aplicar_escolha(jogador, escolha)
             turno_offset += 1
+        if rast:
+            rast.fechar("coleta")
 
     def fase_parede_e_pontuacao(self):
+        rast = rastreio.ATIVO
+        if rast:
+            rast.abrir("pontuacao", rodada=self.rodada)
         for jogador in self.jogadores:
             pontos_ganhos, to_discard = jogador.tabuleiro.finalizar_rodada()
             jogador.pontos += pontos_ganhos
@@ -100,12 +210,14 @@ class Jogo:
                 self.saco.descartar(to_discard)
         # após fase de pontuação, resetamos owner_first_token (o token ficará no centro para próxima rodada)
         self.owner_first_token = None
+        self.hash = hash_jogo(self)
+        if rast:
+            rast.fechar("pontuacao")
 
     def jogo_terminou(self):
         for jogador in self.jogadores:
-            for r in range(5):
-                if all(jogador.tabuleiro.parede[r][c] is not None for c in range(5)):
-                    return True
+            if jogador.tabuleiro.tem_linha_completa():
+                return True
         return False
 
     def aplicar_bonificacoes_finais(self):
@@ -0,0 +1,297 @@
+# lote.py
+"""
+Motor de rodadas em lote (struct-of-arrays com NumPy): B estados independentes avançam
+juntos, uma jogada por estado a cada passo, com as mesmas regras de Jogo/Tabuleiro.
+Arrays (B = tamanho do lote, P = jogadores, F = 1 + expositores):
+    fontes[b, f, cor]     peças por cor; f = 0 é o centro, f = 1.. os expositores
+                          (a codificação de fonte de movimentos.py)
+    token[b]              token do primeiro jogador ainda no centro
+    dono_token[b]         quem pegou o token na rodada (-1 = ninguém)
+    vez[b]                jogador da vez
+    linha_cor/linha_qtd[b, p, linha]     linhas padrão (cor -1 = vazia)
+    mascara_linhas[b, p, linha]          bit coluna ligado se (linha, coluna) ocupada na parede
+    mascara_colunas[b, p, coluna]        bit linha ligado se (linha, coluna) ocupada
+    piso_n[b, p], piso[b, p, :7]         tamanho do piso e o conteúdo das 7 primeiras posições
+                                         (cor, ou TOKEN), as únicas que pontuam e voltam ao saco
+    pontos[b, p]
+Políticas vetorizadas: "greedy" (ai_agents.escolha_gulosa), "cpu" (Jogador._escolha_cpu),
+"first" (primeira jogada legal) e "random"; em empate valem as mesmas regras dos originais,
+na ordem de movimentos.listar_movimentos, então o lote reproduz as mesmas jogadas.
+"""
+
+import numpy as np
+from azulejos import CORES_POR_VALOR
+from score import PONTOS_COLOCACAO
+from tabuleiro import COLUNA_DA_COR, PENALIDADE_PISO
+
+TOKEN = 5          # código do token no array do piso
+MAX_PISO = 7       # posições do piso que contam (FLOOR_PENALTIES)
+CHEIA = 0b11111
+
+_PONTOS = np.array(PONTOS_COLOCACAO, dtype=np.int32)            # [posição][máscara linha][máscara coluna]
+_PENALIDADE = np.array(PENALIDADE_PISO, dtype=np.int32)          # [min(tamanho do piso, 7)]
+_COLUNA = np.array(COLUNA_DA_COR, dtype=np.int64)                 # [linha][cor]
+_COLUNA_T = _COLUNA.T.copy()                                      # [cor][linha]
+_CAPACIDADE = np.arange(1, 6)
+_ORDEM_CORES = np.array([c.indice for c in CORES_POR_VALOR])
+_POSTO_COR = np.argsort(_ORDEM_CORES)                             # posição da cor na ordem por valor
+_POS_PISO = np.arange(MAX_PISO)
+
+
+class LoteRodadas:
+    def __init__(self, tamanho, n_jogadores, n_expositores):
+        b, p, f = tamanho, n_jogadores, n_expositores + 1
+        self.tamanho = b
+        self.n_jogadores = p
+        self.fontes = np.zeros((b, f, 5), dtype=np.int64)
+        self.token = np.zeros(b, dtype=bool)
+        self.dono_token = np.full(b, -1, dtype=np.int64)
+        self.vez = np.zeros(b, dtype=np.int64)
+        self.linha_cor = np.full((b, p, 5), -1, dtype=np.int64)
+        self.linha_qtd = np.zeros((b, p, 5), dtype=np.int64)
+        self.mascara_linhas = np.zeros((b, p, 5), dtype=np.int64)
+        self.mascara_colunas = np.zeros((b, p, 5), dtype=np.int64)
+        self.piso_n = np.zeros((b, p), dtype=np.int64)
+        self.piso = np.full((b, p, MAX_PISO), -1, dtype=np.int64)
+        self.pontos = np.zeros((b, p), dtype=np.int64)
+
+    @classmethod
+    def de_jogo(cls, jogo, tamanho, vez=0):
+        """Lote com `tamanho` cópias do estado atual de um Jogo (jogador da vez: vez)."""
+        lote = cls(1, len(jogo.jogadores), len(jogo.expositores))
+        lote.fontes[0, 0] = jogo.centro.contagem
+        for f, e in enumerate(jogo.expositores):
+            lote.fontes[0, f + 1] = e.contagem
+        lote.token[0] = jogo.centro.token_primeiro
+        if jogo.owner_first_token is not None:
+            lote.dono_token[0] = jogo.jogadores.index(jogo.owner_first_token)
+        lote.vez[0] = vez
+        for p, jogador in enumerate(jogo.jogadores):
+            t = jogador.tabuleiro
+            lote.linha_cor[0, p] = [c.indice if c is not None else -1 for c in t.linha_cor]
+            lote.linha_qtd[0, p] = t.linha_qtd
+            lote.mascara_linhas[0, p] = [(t.parede_bits >> (5 * i)) & CHEIA for i in range(5)]
+            lote.mascara_colunas[0, p] = t.mascara_colunas
+            lote.piso_n[0, p] = len(t.piso)
+            for i, az in enumerate(t.piso[:MAX_PISO]):
+                lote.piso[0, p, i] = TOKEN if az == "TOKEN" else az.indice
+            lote.pontos[0, p] = jogador.pontos
+        return lote.repetir(tamanho)
+
+    def repetir(self, n):
+        """Novo lote com cada estado repetido n vezes (em sequência)."""
+        novo = object.__new__(type(self))
+        for nome, valor in vars(self).items():
+            setattr(novo, nome, np.repeat(valor, n, axis=0) if isinstance(valor, np.ndarray) else valor)
+        novo.tamanho = self.tamanho * n
+        return novo
+
+    def selecionar(self, idx):
+        """Novo lote só com os estados de idx (na ordem de idx)."""
+        novo = object.__new__(type(self))
+        for nome, valor in vars(self).items():
+            setattr(novo, nome, valor[idx] if isinstance(valor, np.ndarray) else valor)
+        novo.tamanho = len(idx)
+        return novo
+
+    def preparar_rodada(self, expositores):
+        """Nova rodada (Jogo.preparar_rodada): expositores[b, e, cor] sorteados, centro só com o token."""
+        self.fontes[:, 0] = 0
+        self.fontes[:, 1:] = expositores
+        self.token[:] = True
+        self.dono_token[:] = -1
+        self.vez[:] = 0
+
+    # ---------- regras ----------
+
+    def ativos(self):
+        """Índices dos estados com peças nas fontes (rodada ainda em coleta)."""
+        return np.flatnonzero(self.fontes.any(axis=(1, 2)))
+
+    def _aceitas(self, idx, p, cores=None):
+        """
+        aceita[i, cor, linha]: a linha padrão do jogador p aceita a cor (Tabuleiro.linhas_para_cor).
+        Com cores[i], só a dessa cor: aceita[i, linha].
+        """
+        qtd = self.linha_qtd[idx, p]
+        cor = self.linha_cor[idx, p]
+        parede = self.mascara_linhas[idx, p]
+        if cores is None:
+            qtd, cor, parede = qtd[:, None, :], cor[:, None, :], parede[:, None, :]
+            cores, colunas = np.arange(5)[None, :, None], _COLUNA_T[None]
+        else:
+            cores, colunas = cores[:, None], _COLUNA_T[cores]
+        return (qtd < _CAPACIDADE) & ((qtd == 0) | (cor == cores)) & ((parede >> colunas) & 1 == 0)
+
+    def _candidatas(self, idx, p):
+        """
+        (legais, valor) com forma [i, fonte, cor, linha 0..4 + piso]: jogadas legais (como
+        movimentos.gerar_movimentos) e 2 * a variação da avaliação que
+        ai_agents.escolha_gulosa compara em cada uma.
+        """
+        # int16 basta para os valores (no máximo algumas dezenas) e deixa os arrays 4x menores
+        cont = self.fontes[idx].astype(np.int16)
+        aceitas = self._aceitas(idx, p)
+        tem = cont > 0
+        espaco = (_CAPACIDADE - self.linha_qtd[idx, p]).astype(np.int16)  # [i, linha]
+        na_linha = np.minimum(cont[..., None], espaco[:, None, None, :])  # [i, fonte, cor, linha]
+        token = np.zeros(cont.shape[:2], dtype=np.int16)
+        token[:, 0] = 2 * self.token[idx]
+        valor = np.empty(cont.shape + (6,), dtype=np.int16)
+        valor[..., :5] = 2 * na_linha - cont[..., None]
+        valor[..., 5] = -cont
+        valor -= token[..., None, None]
+        legais = np.empty(valor.shape, dtype=bool)
+        legais[..., :5] = tem[..., None] & aceitas[:, None]
+        legais[..., 5] = tem & ~aceitas.any(axis=2)[:, None]
+        return legais, valor
+
+    def _em_ordem(self, arr):
+        """[i, fonte, cor, linha] -> [i, n] na ordem de listar_movimentos (expositores, centro; cores por valor)."""
+        n_fontes = arr.shape[1]
+        fontes = np.r_[1:n_fontes, 0]
+        return arr[:, fontes][:, :, _ORDEM_CORES].reshape(len(arr), -1)
+
+    def _decodificar(self, pos, n_fontes):
+        """Inverso de _em_ordem: posição achatada -> (fonte, cor, linha)."""
+        fonte, resto = np.divmod(pos, 30)
+        cor, linha = np.divmod(resto, 6)
+        fonte = np.where(fonte == n_fontes - 1, 0, fonte + 1)
+        linha = np.where(linha == 5, -1, linha)
+        return fonte, _ORDEM_CORES[cor], linha
+
+    def escolher(self, idx, politica="greedy", rng=None):
+        """(fonte, cor, linha) escolhidas pelo jogador da vez em cada estado de idx."""
+        p = self.vez[idx]
+        n_fontes = self.fontes.shape[1]
+        if politica == "cpu":
+            return self._escolha_cpu(idx, p)
+        legais, valor = self._candidatas(idx, p)
+        legais = self._em_ordem(legais)
+        if politica == "greedy":
+            pontuacao = np.where(legais, self._em_ordem(valor), np.iinfo(np.int16).min)
+        elif politica == "random":
+            pontuacao = np.where(legais, rng.random(legais.shape), -1.0)
+        else:
+            pontuacao = legais
+        # argmax devolve a primeira posição máxima: empate fica com a jogada listada antes
+        return self._decodificar(pontuacao.argmax(axis=1), n_fontes)
+
+    def _escolha_cpu(self, idx, p):
+        """Jogador._escolha_cpu: fonte/cor com mais peças (empate: cor por valor, depois a fonte listada antes)."""
+        cont = self.fontes[idx]
+        n_fontes = cont.shape[1]
+        ordem_fonte = np.r_[n_fontes - 1, 0:n_fontes - 1]  # posição de cada fonte na listagem
+        chave = (cont * 5 + (4 - _POSTO_COR)) * n_fontes + (n_fontes - 1 - ordem_fonte)[:, None]
+        chave = np.where(cont > 0, chave, -1).reshape(len(idx), -1)
+        fonte, cor = np.divmod(chave.argmax(axis=1), 5)
+        aceitas = self._aceitas(idx, p, cor)                                # [i, linha]
+        qtd = self.linha_qtd[idx, p]
+        com_pecas = aceitas & (qtd > 0)
+        linha = np.where(com_pecas.any(axis=1), np.where(com_pecas, qtd, -1).argmax(axis=1),
+                         np.where(aceitas.any(axis=1), aceitas.argmax(axis=1), -1))
+        return fonte, cor, linha
+
+    def aplicar(self, idx, fonte, cor, linha):
+        """Aplica uma jogada do jogador da vez em cada estado de idx (como Jogo.aplicar) e passa a vez."""
+        p = self.vez[idx]
+        qtd = self.fontes[idx, fonte, cor]
+        no_centro = fonte == 0
+        # expositor: o resto vai para o centro; centro: leva o token se ainda estiver lá
+        ie, fe = idx[~no_centro], fonte[~no_centro]
+        resto = self.fontes[ie, fe]
+        resto[np.arange(len(ie)), cor[~no_centro]] = 0
+        self.fontes[ie, 0] += resto
+        self.fontes[ie, fe] = 0
+        self.fontes[idx[no_centro], 0, cor[no_centro]] = 0
+        pega_token = no_centro & self.token[idx]
+
+        na_linha = np.zeros_like(qtd)
+        em_linha = linha >= 0
+        il, pl, ll = idx[em_linha], p[em_linha], linha[em_linha]
+        na_linha[em_linha] = np.minimum(qtd[em_linha], ll + 1 - self.linha_qtd[il, pl, ll])
+        self.linha_qtd[il, pl, ll] += na_linha[em_linha]
+        self.linha_cor[il, pl, ll] = cor[em_linha]
+        # piso: primeiro as peças que sobram, depois o token
+        self._ao_piso(idx, p, qtd - na_linha, cor)
+        it = idx[pega_token]
+        self._ao_piso(it, p[pega_token], np.ones(len(it), dtype=np.int64), np.full(len(it), TOKEN))
+        self.token[it] = False
+        sem_dono = self.dono_token[it] == -1
+        self.dono_token[it[sem_dono]] = p[pega_token][sem_dono]
+        self.vez[idx] = (p + 1) % self.n_jogadores
+
+    def _ao_piso(self, idx, p, n, codigo):
+        inicio = self.piso_n[idx, p]
+        posicoes = (_POS_PISO >= inicio[:, None]) & (_POS_PISO < (inicio + n)[:, None])
+        linhas, cols = np.nonzero(posicoes)
+        self.piso[idx[linhas], p[linhas], cols] = codigo[linhas]
+        self.piso_n[idx, p] = inicio + n
+
+    def jogar(self, politica="greedy", max_jogadas=None, rng=None):
+        """Joga até as fontes esvaziarem (ou max_jogadas passos). Retorna o total de jogadas aplicadas."""
+        jogadas = passos = 0
+        while max_jogadas is None or passos < max_jogadas:
+            idx = self.ativos()
+            if not len(idx):
+                break
+            self.aplicar(idx, *self.escolher(idx, politica, rng))
+            jogadas += len(idx)
+            passos += 1
+        return jogadas
+
+    # ---------- pontuação ----------
+
+    def _colocacoes(self, mascara_linhas, mascara_colunas, alterar):
+        """Pontos (colocações + piso) do fim da rodada, [b, p]; com alterar, executa a colocação."""
+        pontos = _PENALIDADE[np.minimum(self.piso_n, MAX_PISO)].astype(np.int64)
+        descarte = np.zeros((self.tamanho, 5), dtype=np.int64)
+        for i in range(5):
+            completa = self.linha_qtd[..., i] == i + 1
+            b, p = np.nonzero(completa)
+            cor = self.linha_cor[b, p, i]
+            col = _COLUNA[i, cor]
+            pontos[b, p] += _PONTOS[i * 5 + col, mascara_linhas[b, p, i], mascara_colunas[b, p, col]]
+            mascara_linhas[b, p, i] |= 1 << col
+            mascara_colunas[b, p, col] |= 1 << i
+            if alterar:
+                np.add.at(descarte, (b, cor), i)
+                self.linha_qtd[b, p, i] = 0
+                self.linha_cor[b, p, i] = -1
+        return pontos, descarte
+
+    def pontos_fim_rodada(self):
+        """Tabuleiro.pontos_fim_rodada de todos os jogadores, [b, p], sem alterar o lote."""
+        return self._colocacoes(self.mascara_linhas.copy(), self.mascara_colunas.copy(), False)[0]
+
+    def finalizar_rodada(self):
+        """
+        Tabuleiro.finalizar_rodada de todos os jogadores: soma os pontos, esvazia linhas
+        completas e piso. Retorna o descarte por cor de cada estado, [b, cor].
+        """
+        ganhos, descarte = self._colocacoes(self.mascara_linhas, self.mascara_colunas, True)
+        self.pontos += ganhos
+        piso = self.piso
+        for k in range(5):
+            descarte[:, k] += (piso == k).sum(axis=(1, 2))
+        self.piso_n[:] = 0
+        self.piso[:] = -1
+        return descarte
+
+    def estimativa_parcial(self, jogador):
+        """ai_agents.estimativa_parcial do jogador em todos os estados (pontos + fim de rodada + linhas)."""
+        qtd = self.linha_qtd[:, jogador]
+        incompletas = np.where(qtd < _CAPACIDADE, qtd, 0).sum(axis=1)
+        return self.pontos[:, jogador] + self.pontos_fim_rodada()[:, jogador] + 0.5 * incompletas
+
+    def tem_linha_completa(self):
+        """[b]: algum jogador completou uma linha da parede (fim de jogo)."""
+        return (self.mascara_linhas == CHEIA).any(axis=(1, 2))
+
+    def bonus_final(self):
+        """Tabuleiro.pontuacao_final_bonificacoes, [b, p]: linhas (+2), colunas (+7) e cores (+10)."""
+        linhas = (self.mascara_linhas == CHEIA).sum(axis=2)
+        colunas = (self.mascara_colunas == CHEIA).sum(axis=2)
+        ocupada = (self.mascara_linhas[..., :, None] >> np.arange(5)) & 1   # [b, p, linha, coluna]
+        cores = ocupada[..., np.arange(5)[:, None], _COLUNA].all(axis=2).sum(axis=2)
+        return 2 * linhas + 7 * colunas + 10 * cores
@@ -0,0 +1,99 @@
+# movimentos.py
+"""
+Gerador de jogadas legais com codificação inteira compacta:
+    jogada = (fonte << 6) | (cor.indice << 3) | (linha + 1)
+    fonte: 0 = centro, f + 1 = expositor f (0-based); linha: 0..4, ou -1 para o piso.
+As linhas aceitas por cor vêm de Tabuleiro.linhas_para_cor (mantido a cada jogada) e as
+quantidades das contagens dos expositores/centro, então gerar não varre parede nem listas.
+A ordem é a mesma de ai_agents.gerar_opcoes_para_jogador: expositores, depois centro;
+cores por valor; linhas crescentes (piso só quando nenhuma linha aceita a cor).
+"""
+
+from azulejos import ALL_COLORS, CORES_POR_VALOR
+from zobrist import ZOB_VEZ
+
+FONTE_CENTRO = 0
+_ORDEM_CORES = [c.indice for c in CORES_POR_VALOR]
+# LINHAS_DA_MASCARA[m]: códigos (linha + 1) das linhas ligadas na máscara m; (0,) = só piso
+LINHAS_DA_MASCARA = [tuple(r + 1 for r in range(5) if m >> r & 1) or (0,) for m in range(32)]
+
+MAX_CACHE = 50_000
+_cache = {}
+
+
+def para_opcao(jogada):
+    """Jogada codificada -> tupla (fonte, idx or None, cor, linha) de gerar_opcoes_para_jogador."""
+    fonte = jogada >> 6
+    cor = ALL_COLORS[(jogada >> 3) & 7]
+    if fonte == FONTE_CENTRO:
+        return ("centro", None, cor, (jogada & 7) - 1)
+    return ("expositor", fonte - 1, cor, (jogada & 7) - 1)
+
+
+def para_escolha(jogada):
+    """Jogada codificada -> dict no formato de escolher_jogada / Jogo.aplicar."""
+    opcao = para_opcao(jogada)
+    return {"fonte": (opcao[0], opcao[1]), "cor": opcao[2], "linha": opcao[3]}
+
+
+def gerar_movimentos(game, jogador_idx):
+    """Gera (lazy) as jogadas legais do jogador, fonte a fonte."""
+    permitidas = game.jogadores[jogador_idx].tabuleiro.linhas_para_cor
+    for f, e in enumerate(game.expositores):
+        if not e.total:
+            continue
+        contagem = e.contagem
+        for k in _ORDEM_CORES:
+            if contagem[k]:
+                base = ((f + 1) << 6) | (k << 3)
+                for ln in LINHAS_DA_MASCARA[permitidas[k]]:
+                    yield base | ln
+    contagem = game.centro.contagem
+    if game.centro.total:
+        for k in _ORDEM_CORES:
+            if contagem[k]:
+                base = k << 3
+                for ln in LINHAS_DA_MASCARA[permitidas[k]]:
+                    yield base | ln
+
+
+def listar_movimentos(game, jogador_idx):
+    """
+    Tupla com todas as jogadas legais do jogador, guardada em cache pela chave Zobrist
+    (Jogo.hash + jogador): posições repetidas em buscas e rollouts não geram de novo.
+    A tupla é compartilhada; quem precisar reordenar deve copiá-la.
+    """
+    chave = game.hash ^ ZOB_VEZ[jogador_idx]
+    movs = _cache.get(chave)
+    if movs is None:
+        movs = tuple(gerar_movimentos(game, jogador_idx))
+        if len(_cache) >= MAX_CACHE:
+            _cache.clear()
+        _cache[chave] = movs
+    return movs
+
+
+def quantidade_na_fonte(game, jogada):
+    fonte = jogada >> 6
+    contagem = game.centro.contagem if fonte == FONTE_CENTRO else game.expositores[fonte - 1].contagem
+    return contagem[(jogada >> 3) & 7]
+
+
+def ordenar_movimentos(game, jogador_idx, movs):
+    """
+    Lista das jogadas ordenadas da mais para a menos promissora (para cortes alfa-beta):
+    mais peças aproveitadas na linha primeiro, menos peças indo para o piso depois.
+    Empates mantêm a ordem de geração.
+    """
+    tabuleiro = game.jogadores[jogador_idx].tabuleiro
+
+    def chave(jogada):
+        qtd = quantidade_na_fonte(game, jogada)
+        linha = (jogada & 7) - 1
+        if linha < 0:
+            return (0, qtd)
+        espaco = linha + 1 - tabuleiro.linha_qtd[linha]
+        usadas = min(qtd, espaco)
+        return (-usadas, qtd - usadas)
+
+    return sorted(movs, key=chave)
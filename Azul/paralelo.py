@@ -0,0 +1,35 @@
+# paralelo.py
+"""
+Pools de processos persistentes para as buscas paralelas dos agentes.
+obter_pool(n) cria o pool de n processos na primeira chamada e devolve o mesmo pool
+nas seguintes, de modo que o custo de subir os processos não entra em cada decisão.
+Os pools são encerrados na saída do processo, inclusive dentro de um processo do pool do
+simulador (--workers), que sai por multiprocessing e não roda o atexit: lá, sem encerrar
+antes, ele ficaria esperando para sempre os processos do pool interno.
+"""
+
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+import rastreio
+
+_POOLS = {}  # número de processos -> ProcessPoolExecutor
+
+
+def _iniciar_processo():
+    # Ctrl-C é tratado só no processo principal; o rastreio herdado no fork não é coletado
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    rastreio.ATIVO = None
+
+
+def obter_pool(processos):
+    pool = _POOLS.get(processos)
+    if pool is None:
+        pool = _POOLS[processos] = ProcessPoolExecutor(max_workers=processos,
+                                                       initializer=_iniciar_processo)
+        # registrado aqui, no processo dono do pool: um processo criado por fork começa com
+        # os finalizadores de multiprocessing vazios. A prioridade alta faz o pool ser
+        # encerrado antes das filas dele (prioridade 10) e antes de multiprocessing esperar
+        # os processos filhos (util._exit_function, que no processo principal roda no atexit)
+        util.Finalize(pool, pool.shutdown, kwargs={"cancel_futures": True}, exitpriority=100)
+    return pool
@@ -0,0 +1,177 @@
+# partidas_lote.py
+"""
+Partidas completas entre jogadores "cpu" (Jogador._escolha_cpu) simuladas em lote, sobre
+lote.LoteRodadas: todas as rodadas, reposição do saco pelo descarte e bonificações finais.
+O resultado de cada partida é o mesmo de simulador.run_single_game(["cpu", "cpu"], seed)
+com a mesma semente: o saco de cada partida sorteia com o seu próprio random.Random, aqui
+reproduzido em NumPy (_GeradoresMT), na mesma ordem de Saco.puxar_rodada.
+Como em run_single_game, toda rodada começa pelo primeiro assento.
+"""
+
+import random
+import numpy as np
+from aleatorio import derivar_semente
+from lote import LoteRodadas
+
+POR_EXPOSITOR = 4
+
+# Mersenne Twister (MT19937) do módulo random do CPython
+_N, _M = 624, 397
+_SUPERIOR, _INFERIOR = np.uint32(0x80000000), np.uint32(0x7fffffff)
+_MATRIZ = np.array([0, 0x9908b0df], dtype=np.uint32)
+_BITS = np.array([int(n).bit_length() for n in range(256)], dtype=np.uint32)  # n.bit_length()
+
+
+def _estado_inicial():
+    # init_genrand(19650218), o ponto de partida de init_by_array (igual para toda semente)
+    mt = [19650218]
+    for i in range(1, _N):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xffffffff)
+    return np.array(mt, dtype=np.uint32)
+
+
+class _GeradoresMT:
+    """
+    Um random.Random(semente) por partida, vetorizado: estado [624, B] (uma coluna por
+    partida), cada partida com a sua posição no fluxo. abaixo(g, n) devolve o mesmo que
+    randrange(n) daria na partida g.
+    """
+
+    def __init__(self, sementes):
+        b = len(sementes)
+        # random.seed(int): a semente vira a chave de init_by_array em palavras de 32 bits
+        chave0 = np.array([s & 0xffffffff for s in sementes], dtype=np.uint32)
+        chave1 = np.array([s >> 32 for s in sementes], dtype=np.uint32)
+        uma_palavra = np.array([s >> 32 == 0 for s in sementes])
+        # key[j] + j para j par (sempre 0) e ímpar (volta a 0 se a chave tem uma palavra só)
+        chave_par, chave_impar = chave0, np.where(uma_palavra, chave0, chave1 + np.uint32(1))
+        mt = np.repeat(_estado_inicial()[:, None], b, axis=1)
+        i = 1
+        for k in range(_N):
+            anterior = mt[i - 1]
+            mt[i] = (mt[i] ^ ((anterior ^ (anterior >> 30)) * np.uint32(1664525))) \
+                + (chave_par if k % 2 == 0 else chave_impar)
+            i += 1
+            if i >= _N:
+                mt[0] = mt[_N - 1]
+                i = 1
+        for k in range(_N - 1):
+            anterior = mt[i - 1]
+            mt[i] = (mt[i] ^ ((anterior ^ (anterior >> 30)) * np.uint32(1566083941))) - np.uint32(i)
+            i += 1
+            if i >= _N:
+                mt[0] = mt[_N - 1]
+                i = 1
+        mt[0] = _SUPERIOR
+        self.mt = mt
+        self.saida = np.empty_like(mt)          # estado temperado: as próximas 624 saídas
+        self.posicao = np.full(b, _N, dtype=np.int64)
+
+    def _renovar(self, g):
+        """Gera o próximo bloco de 624 saídas das partidas g (twist + tempering)."""
+        mt = self.mt[:, g]
+        # mt[i] depende de mt[i + 1] antigo e de mt[i + 397], que a partir de i = 227 já é
+        # novo: em fatias em que nenhuma lê o que ela mesma escreve
+        for ini, fim in ((0, _N - _M), (_N - _M, 2 * (_N - _M)), (2 * (_N - _M), _N - 1)):
+            par = _M if fim + _M <= _N else _M - _N
+            y = (mt[ini:fim] & _SUPERIOR) | (mt[ini + 1:fim + 1] & _INFERIOR)
+            mt[ini:fim] = mt[ini + par:fim + par] ^ (y >> 1) ^ _MATRIZ[y & 1]
+        y = (mt[_N - 1] & _SUPERIOR) | (mt[0] & _INFERIOR)
+        mt[_N - 1] = mt[_M - 1] ^ (y >> 1) ^ _MATRIZ[y & 1]
+        self.mt[:, g] = mt
+        y = mt ^ (mt >> 11)
+        y ^= (y << 7) & np.uint32(0x9d2c5680)
+        y ^= (y << 15) & np.uint32(0xefc60000)
+        self.saida[:, g] = y ^ (y >> 18)
+        self.posicao[g] = 0
+
+    def _proximo(self, g):
+        """Próxima saída de 32 bits (genrand_uint32) das partidas g."""
+        acabou = self.posicao[g] == _N
+        if acabou.any():
+            self._renovar(g[acabou])
+        pos = self.posicao[g]
+        self.posicao[g] = pos + 1
+        return self.saida[pos, g]
+
+    def abaixo(self, g, n):
+        """randrange(n[i]) na partida g[i] (Random._randbelow: getrandbits(k) até cair abaixo de n)."""
+        desloc = np.uint32(32) - _BITS[n]
+        r = (self._proximo(g) >> desloc).astype(np.int64)
+        fora = np.flatnonzero(r >= n)
+        while len(fora):
+            r[fora] = self._proximo(g[fora]) >> desloc[fora]
+            fora = fora[r[fora] >= n[fora]]
+        return r
+
+
+class _SacosLote:
+    """Saco (contagem e descarte por cor) de cada partida, com o sorteio de Saco.puxar_rodada."""
+
+    def __init__(self, sementes):
+        b = len(sementes)
+        self.geradores = _GeradoresMT(sementes)
+        self.contagem = np.full((b, 5), 20, dtype=np.int64)
+        self.descarte = np.zeros((b, 5), dtype=np.int64)
+
+    def puxar_rodada(self, g, num_expositores):
+        """Contagens [i, expositor, cor] dos expositores da rodada nas partidas g."""
+        resultado = np.zeros((len(g), num_expositores, 5), dtype=np.int64)
+        linhas = np.arange(len(g))
+        for e in range(num_expositores):
+            for _ in range(POR_EXPOSITOR):
+                total = self.contagem[g].sum(axis=1)
+                vazio = total == 0
+                if vazio.any():
+                    # repor do descarte; o saco que continua vazio não sorteia mais na rodada
+                    gv = g[vazio]
+                    self.contagem[gv] = self.descarte[gv]
+                    self.descarte[gv] = 0
+                    total[vazio] = self.contagem[gv].sum(axis=1)
+                sorteia = np.flatnonzero(total)
+                gs = g[sorteia]
+                r = self.geradores.abaixo(gs, total[sorteia])
+                cor = (np.cumsum(self.contagem[gs], axis=1) <= r[:, None]).sum(axis=1)
+                self.contagem[gs, cor] -= 1
+                resultado[linhas[sorteia], e, cor] += 1
+        return resultado
+
+
+def semente_do_saco(seed):
+    """Semente do random.Random do saco de run_single_game(seed=seed) (aleatorio.criar_rng(seed, "jogo"))."""
+    if seed is None:
+        return random.SystemRandom().getrandbits(64)
+    return derivar_semente(seed, "jogo")
+
+
+def jogar_partidas(sementes, n_jogadores=2):
+    """
+    Joga uma partida cpu x cpu por semente (a semente da partida, como em run_single_game).
+    Retorna, por partida, (pontos finais, pontos após cada rodada, decisões por assento),
+    os mesmos valores de run_single_game e do seu dict `detalhes`.
+    """
+    n = len(sementes)
+    n_expositores = 5 if n_jogadores == 2 else 7  # como Jogo.num_expositores
+    sacos = _SacosLote([semente_do_saco(s) for s in sementes])
+    lote = LoteRodadas(n, n_jogadores, n_expositores)
+    partidas = np.arange(n)           # partida de cada estado ainda no lote
+    pontos = np.zeros((n, n_jogadores), dtype=np.int64)
+    decisoes = np.zeros((n, n_jogadores), dtype=np.int64)
+    por_rodada = [[] for _ in range(n)]
+    while len(partidas):
+        lote.preparar_rodada(sacos.puxar_rodada(partidas, n_expositores))
+        idx = lote.ativos()
+        while len(idx):
+            decisoes[partidas[idx], lote.vez[idx]] += 1
+            lote.aplicar(idx, *lote.escolher(idx, "cpu"))
+            idx = lote.ativos()
+        sacos.descarte[partidas] += lote.finalizar_rodada()
+        for g, placar in zip(partidas.tolist(), lote.pontos.tolist()):
+            por_rodada[g].append(placar)
+        fim = lote.tem_linha_completa()
+        if fim.any():
+            pontos[partidas[fim]] = lote.pontos[fim] + lote.bonus_final()[fim]
+            continua = np.flatnonzero(~fim)
+            lote = lote.selecionar(continua)
+            partidas = partidas[continua]
+    return list(zip(pontos.tolist(), por_rodada, decisoes.tolist()))
@@ -0,0 +1,84 @@
+# rastreio.py
+"""
+Rastreio opcional de trechos (spans) do jogo no formato Chrome trace-event JSON
+(abrir em chrome://tracing ou https://ui.perfetto.dev).
+Desligado por padrão: o código instrumentado faz só
+
+    rast = rastreio.ATIVO
+    if rast:
+        rast.abrir("rodada", n=3)
+    ...
+    if rast:
+        rast.fechar("rodada")
+
+e, com ATIVO = None, o custo é uma leitura de atributo e um teste por trecho.
+Trechos usados: partida > rodada > preparar_rodada | coleta > turno > decisao > rollout,
+e pontuacao (Jogo.fase_parede_e_pontuacao) dentro da rodada.
+"""
+
+import json
+import os
+import time
+
+ATIVO = None  # Rastreador em uso no processo, ou None
+
+
+class Rastreador:
+    """Acumula eventos "B"/"E" (início/fim) com tempo em microssegundos."""
+
+    def __init__(self, tid=0):
+        self.eventos = []
+        self.pid = os.getpid()
+        self.tid = tid
+
+    def abrir(self, nome, **args):
+        evento = {"name": nome, "ph": "B", "ts": time.perf_counter_ns() / 1000,
+                  "pid": self.pid, "tid": self.tid}
+        if args:
+            evento["args"] = args
+        self.eventos.append(evento)
+
+    def fechar(self, nome):
+        self.eventos.append({"name": nome, "ph": "E", "ts": time.perf_counter_ns() / 1000,
+                             "pid": self.pid, "tid": self.tid})
+
+    def retirar_eventos(self):
+        eventos, self.eventos = self.eventos, []
+        return eventos
+
+
+def ligar(tid=0):
+    """Instala um Rastreador novo como ATIVO e o retorna."""
+    global ATIVO
+    ATIVO = Rastreador(tid)
+    return ATIVO
+
+
+def desligar():
+    """Remove o Rastreador ATIVO e retorna os eventos que ele acumulou."""
+    global ATIVO
+    rastreador, ATIVO = ATIVO, None
+    return rastreador.retirar_eventos() if rastreador else []
+
+
+class ArquivoTrace:
+    """
+    Grava eventos em JSON no formato de array do Chrome trace à medida que chegam
+    (partidas longas não precisam ficar com todos os eventos em memória).
+    """
+
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "w", encoding="utf-8")
+        self.arquivo.write("[\n")
+        self._primeiro = True
+
+    def gravar(self, eventos):
+        for evento in eventos:
+            if not self._primeiro:
+                self.arquivo.write(",\n")
+            self.arquivo.write(json.dumps(evento))
+            self._primeiro = False
+
+    def fechar(self):
+        self.arquivo.write("\n]\n")
+        self.arquivo.close()
@@ -0,0 +1,236 @@
+# resultados.py
+"""
+Saída incremental das partidas do simulador.
+Cada partida vira um registro (dict) gravado em JSONL ou CSV assim que termina, com flush
+a cada linha: se uma rodada longa cair no meio, o que já foi jogado continua no disco e
+pode ser retomado com --resume. Os agregados (taxa de vitória, margem média e intervalos
+de confiança) são atualizados a cada partida, sem guardar a lista de resultados.
+"""
+
+import csv
+import json
+import math
+import os
+
+Z_95 = 1.959963984540054  # quantil da normal para intervalo de 95%
+
+
+def formato_do_caminho(caminho, formato=None):
+    """'jsonl' ou 'csv': o formato pedido ou, se None, o indicado pela extensão do arquivo."""
+    if formato:
+        return formato
+    return "csv" if caminho.lower().endswith(".csv") else "jsonl"
+
+
+def _linha_csv(registro):
+    # campos com listas viram JSON dentro da célula
+    return {k: json.dumps(v) if isinstance(v, (list, dict)) else v for k, v in registro.items()}
+
+
+def _registro_csv(linha):
+    registro = {}
+    for k, v in linha.items():
+        try:
+            registro[k] = json.loads(v)
+        except (TypeError, ValueError):
+            registro[k] = v
+    return registro
+
+
+def _cortar_linha_incompleta(caminho):
+    """Remove uma última linha sem '\\n' (gravação interrompida) para o append continuar válido."""
+    with open(caminho, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        tamanho = f.tell()
+        if not tamanho:
+            return
+        f.seek(tamanho - 1)
+        if f.read(1) == b"\n":
+            return
+        # volta até o último '\n'
+        pos = tamanho - 1
+        bloco = 4096
+        while pos > 0:
+            inicio = max(0, pos - bloco)
+            f.seek(inicio)
+            trecho = f.read(pos - inicio)
+            k = trecho.rfind(b"\n")
+            if k >= 0:
+                f.truncate(inicio + k + 1)
+                return
+            pos = inicio
+        f.truncate(0)
+
+
+def ler_registros(caminho, formato=None):
+    """Itera os registros já gravados (um por vez; linhas inválidas são ignoradas)."""
+    formato = formato_do_caminho(caminho, formato)
+    with open(caminho, newline="", encoding="utf-8") as f:
+        if formato == "csv":
+            for linha in csv.DictReader(f):
+                yield _registro_csv(linha)
+        else:
+            for linha in f:
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    continue
+
+
+def resultado(registro):
+    """1 / 0.5 / 0: vitória, empate ou derrota do primeiro assento do registro."""
+    margem = registro["margem"]
+    return 1.0 if margem > 0 else 0.0 if margem < 0 else 0.5
+
+
+class GravadorResultados:
+    """
+    Grava registros de partidas em JSONL (um objeto por linha) ou CSV, com flush a cada
+    registro. retomar=True abre em modo append e preserva o que já existe no arquivo.
+    Ao retomar um CSV, as colunas do arquivo têm de ser os campos dos registros novos:
+    `campos` (se dado) é conferido já na abertura; sem ele, confere-se o primeiro registro.
+    """
+
+    def __init__(self, caminho, formato=None, retomar=False, campos=None):
+        self.caminho = caminho
+        self.formato = formato_do_caminho(caminho, formato)
+        existe = retomar and os.path.exists(caminho) and os.path.getsize(caminho) > 0
+        if existe:
+            _cortar_linha_incompleta(caminho)
+            existe = os.path.getsize(caminho) > 0
+        self.arquivo = open(caminho, "a" if existe else "w", newline="", encoding="utf-8")
+        self._csv = None
+        self._campos = None
+        if self.formato == "csv" and existe:
+            with open(caminho, newline="", encoding="utf-8") as f:
+                self._campos = next(csv.reader(f), None)
+            if campos is not None:
+                self._conferir_campos(campos)
+
+    def _conferir_campos(self, campos):
+        if set(campos) != set(self._campos):
+            self.arquivo.close()
+            raise SystemExit(f"{self.caminho}: as colunas do arquivo ({', '.join(self._campos)}) não são "
+                             f"os campos dos registros novos ({', '.join(campos)}); grave em outro arquivo")
+
+    def gravar(self, registro):
+        if self.formato == "csv":
+            if self._csv is None:
+                if self._campos is None:
+                    self._campos = list(registro)
+                    self._csv = csv.DictWriter(self.arquivo, fieldnames=self._campos)
+                    self._csv.writeheader()
+                else:
+                    self._conferir_campos(list(registro))
+                    self._csv = csv.DictWriter(self.arquivo, fieldnames=self._campos)
+            self._csv.writerow(_linha_csv(registro))
+        else:
+            self.arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class EstatisticaCorrente:
+    """Média e variância acumuladas pelo algoritmo de Welford (memória constante)."""
+
+    __slots__ = ("n", "media", "_m2")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+
+    def adicionar(self, x):
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (x - self.media)
+
+    @property
+    def variancia(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def erro_padrao(self):
+        return math.sqrt(self.variancia / self.n) if self.n > 1 else float("inf")
+
+    def intervalo(self, z=Z_95):
+        """Intervalo de confiança (normal) para a média."""
+        meia = z * self.erro_padrao
+        return self.media - meia, self.media + meia
+
+
+def resultado_de_a(registro):
+    """(resultado, margem) do agente --p1, que no registro "trocado" está no segundo assento."""
+    r, margem = resultado(registro), registro["margem"]
+    if registro.get("trocado"):
+        return 1.0 - r, -margem
+    return r, margem
+
+
+class Agregado:
+    """
+    Resumo corrente de um confronto entre dois agentes (a e b, em qualquer assento).
+    Taxa de vitória conta empate como meia vitória; margem = pontos de a - pontos de b.
+    Registros pareados (campo "par", ver simulador.plano_partida) também entram como
+    diferenças pareadas: a média das duas partidas de cada semente, uma em cada assento.
+    Como a sorte do saco é a mesma nas duas, o intervalo da margem pareada costuma ser
+    bem mais estreito que o das partidas avulsas.
+    """
+
+    def __init__(self, a, b):
+        if a == b:
+            a, b = f"{a}_1", f"{b}_2"  # espelho (ex.: greedy x greedy): rótulos por assento
+        self.a = a
+        self.b = b
+        self.vitorias = {a: 0, b: 0, "tie": 0}
+        self.placar = EstatisticaCorrente()  # 1 / 0.5 / 0 por partida, do ponto de vista de a
+        self.margem = EstatisticaCorrente()
+        self.placar_par = EstatisticaCorrente()
+        self.margem_par = EstatisticaCorrente()
+        self.vantagem_assento = EstatisticaCorrente()  # margem média do primeiro assento, por par
+        self._meio_par = {}  # par -> (resultado, margem, margem do 1º assento) da partida já vista
+
+    @property
+    def n(self):
+        return self.margem.n
+
+    def adicionar(self, registro):
+        r, margem = resultado_de_a(registro)
+        self.vitorias[self.a if r == 1.0 else self.b if r == 0.0 else "tie"] += 1
+        self.placar.adicionar(r)
+        self.margem.adicionar(margem)
+        par = registro.get("par")
+        if par is None:
+            return
+        outra = self._meio_par.pop(par, None)
+        if outra is None:
+            self._meio_par[par] = (r, margem, registro["margem"])
+            return
+        self.placar_par.adicionar((r + outra[0]) / 2)
+        self.margem_par.adicionar((margem + outra[1]) / 2)
+        self.vantagem_assento.adicionar((registro["margem"] + outra[2]) / 2)
+
+    def resumo(self):
+        if not self.n:
+            return f"{self.a} x {self.b}: nenhuma partida"
+        lo, hi = self.placar.intervalo()
+        mlo, mhi = self.margem.intervalo()
+        texto = (f"{self.a} x {self.b}: n={self.n} "
+                 f"taxa {self.a}={self.placar.media:.3f} [{max(lo, 0.0):.3f}, {min(hi, 1.0):.3f}] "
+                 f"margem={self.margem.media:+.2f} [{mlo:+.2f}, {mhi:+.2f}]")
+        if self.margem_par.n:
+            plo, phi = self.margem_par.intervalo()
+            vlo, vhi = self.vantagem_assento.intervalo()
+            texto += (f"\n   pareado: pares={self.margem_par.n} taxa {self.a}={self.placar_par.media:.3f} "
+                      f"margem={self.margem_par.media:+.2f} [{plo:+.2f}, {phi:+.2f}] "
+                      f"vantagem do 1º assento={self.vantagem_assento.media:+.2f} [{vlo:+.2f}, {vhi:+.2f}]")
+        return texto
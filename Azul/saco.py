@@ -1,33 +1,91 @@
 # saco.py
+import copy
 import random
-from azulejos import gerar_todos_azulejos
+from azulejos import ALL_COLORS, contagem_de_lista, lista_de_contagem
 
 class Saco:
-    def __init__(self):
-        self.azulejos = gerar_todos_azulejos()
-        self.descarte = []
+    def __init__(self, rng=None):
+        # gerador próprio do saco (injetável); sem rng, usa entropia do sistema
+        self.rng = rng if rng is not None else random.Random()
+        self._rng_compartilhado = False
+        # saco e descarte guardados como contagens por cor (índice = cor.indice)
+        self.contagem = [20] * len(ALL_COLORS)  # 20 azulejos de cada cor (100 total)
+        self.total = sum(self.contagem)
+        self.descarte = [0] * len(ALL_COLORS)
 
-    def embaralhar(self):
-        random.shuffle(self.azulejos)
+    @property
+    def azulejos(self):
+        """Visão (somente leitura) do conteúdo do saco como lista de azulejos."""
+        return lista_de_contagem(self.contagem)
+
+    def clonar(self):
+        novo = Saco.__new__(Saco)
+        novo.contagem = self.contagem[:]
+        novo.total = self.total
+        novo.descarte = self.descarte[:]
+        # copiar o estado do gerador custa mais que o resto do clone; os dois passam a
+        # compartilhá-lo e quem sortear primeiro fica com uma cópia (ver puxar_rodada),
+        # de modo que o outro continua com o gerador como estava no momento do clone
+        novo.rng = self.rng
+        novo._rng_compartilhado = self._rng_compartilhado = True
+        return novo
+
+    def puxar_rodada(self, num_expositores, por_expositor=4):
+        """
+        Sorteia de uma vez o conteúdo de todos os expositores da rodada
+        (num_expositores * por_expositor azulejos, sem montar listas de azulejos).
+        Cada azulejo é sorteado com probabilidade proporcional às contagens restantes;
+        o descarte repõe o saco quando ele esvazia.
+        Retorna uma lista com uma tupla de contagens por expositor (expositores podem vir
+        incompletos se não houver mais peças).
+        """
+        if self._rng_compartilhado:
+            # gerador compartilhado com um clone (ou com o original): não avançar o do outro
+            self.rng = copy.copy(self.rng)
+            self._rng_compartilhado = False
+        randrange = self.rng.randrange
+        contagem = self.contagem
+        total = self.total
+        resultado = []
+        for _ in range(num_expositores):
+            atual = [0] * len(ALL_COLORS)
+            for _ in range(por_expositor):
+                if not total:
+                    # Repor do descarte
+                    contagem = self.contagem = self.descarte
+                    total = sum(contagem)
+                    self.descarte = [0] * len(ALL_COLORS)
+                    if not total:
+                        break
+                r = randrange(total)
+                k = 0
+                while r >= contagem[k]:
+                    r -= contagem[k]
+                    k += 1
+                contagem[k] -= 1
+                total -= 1
+                atual[k] += 1
+            resultado.append(tuple(atual))
+        self.total = total
+        return resultado
+
+    def puxar_contagem(self, n):
+        """
+        Puxa até n azulejos do saco e retorna o vetor de contagens por cor
+        (a soma pode ser menor que n se não houver mais peças).
+        """
+        return list(self.puxar_rodada(1, n)[0])
 
     def puxar(self, n):
         """
         Puxa até n azulejos do saco. Reabastece do descarte se necessário.
         Retorna lista de azulejos (pode ser menos se não houver mais peças).
         """
-        resultado = []
-        while len(resultado) < n:
-            if not self.azulejos:
-                # Repor do descarte
-                self.azulejos = self.descarte
-                self.descarte = []
-                random.shuffle(self.azulejos)
-                if not self.azulejos:
-                    break
-            pegar = min(n - len(resultado), len(self.azulejos))
-            resultado += self.azulejos[:pegar]
-            self.azulejos = self.azulejos[pegar:]
-        return resultado
+        return lista_de_contagem(self.puxar_contagem(n))
 
     def descartar(self, azulejos):
-        self.descarte += azulejos
+        self.descartar_contagem(contagem_de_lista(azulejos))
+
+    def descartar_contagem(self, contagem):
+        for k in range(len(contagem)):
+            self.descarte[k] += contagem[k]
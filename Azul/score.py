@@ -1,6 +1,59 @@
 # score.py
-# (Hoje a lógica de pontuação está embutida em tabuleiro.finalizar_rodada e em Tabuleiro._calcular_pontos_posicao)
-# Este módulo fica disponível caso queira regras/ajustes futuros. Mantido simples.
+# Tabelas de pontuação pré-calculadas usadas pelo Tabuleiro.
+# A pontuação de uma colocação na parede só depende de quais posições da linha e da coluna
+# já estão ocupadas, então é calculada uma única vez para todas as máscaras possíveis.
+
+BONUS_LINHA = 2    # linha horizontal completa na parede
+BONUS_COLUNA = 7   # coluna vertical completa
+BONUS_COR = 10     # as 5 peças de uma mesma cor na parede
+
+
+def _vizinhos_contiguos(mascara, pos):
+    """
+    Conta as posições ocupadas encostadas em `pos` (para os dois lados) numa máscara de 5 bits.
+    O bit da própria posição é ignorado.
+    """
+    total = 0
+    i = pos - 1
+    while i >= 0 and mascara >> i & 1:
+        total += 1
+        i -= 1
+    i = pos + 1
+    while i < 5 and mascara >> i & 1:
+        total += 1
+        i += 1
+    return total
+
+
+def _pontos(mascara_linha, mascara_coluna, row, col):
+    horiz = _vizinhos_contiguos(mascara_linha, col)
+    vert = _vizinhos_contiguos(mascara_coluna, row)
+    # peça isolada vale 1; senão 1 + vizinhos na horizontal + vizinhos na vertical
+    return 1 + horiz + vert
+
+
+# PONTOS_COLOCACAO[row*5 + col][mascara_linha][mascara_coluna]
+# mascara_linha: bit c ligado se (row, c) ocupada; mascara_coluna: bit r ligado se (r, col) ocupada.
+PONTOS_COLOCACAO = [
+    [[_pontos(ml, mc, pos // 5, pos % 5) for mc in range(32)] for ml in range(32)]
+    for pos in range(25)
+]
+
+
+def bonus_da_colocacao(cont_linha, cont_coluna, cont_cor):
+    """
+    Bônus de fim de jogo liberado por uma colocação, dados os contadores já atualizados
+    da linha, da coluna e da cor onde a peça entrou.
+    """
+    bonus = 0
+    if cont_linha == 5:
+        bonus += BONUS_LINHA
+    if cont_coluna == 5:
+        bonus += BONUS_COLUNA
+    if cont_cor == 5:
+        bonus += BONUS_COR
+    return bonus
+
 
 def aplicar_penalidades(pontos, penalty):
     return pontos + penalty
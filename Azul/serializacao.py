@@ -0,0 +1,85 @@
+# serializacao.py
+"""
+Forma compacta (tuplas de inteiros) do estado de um Jogo, para mandar a outros processos
+sem serializar os objetos inteiros: expositores, centro, saco e, por jogador, linhas
+padrão, parede (bits), piso e pontos. Os contadores derivados do Tabuleiro e o hash
+Zobrist são recalculados na volta.
+Os jogadores reconstruídos são Jogador simples ("cpu"): servem para simular, não
+para decidir como o agente original.
+"""
+
+from azulejos import ALL_COLORS
+from centro import CentroMesa
+from expositores import Expositor
+from jogador import Jogador
+from jogo import Jogo
+from saco import Saco
+from tabuleiro import Tabuleiro, WALL_TEMPLATE
+from zobrist import hash_jogo
+
+TOKEN = -1  # marcador do token do primeiro jogador no piso
+
+
+def _serializar_tabuleiro(tab):
+    return (
+        tuple(c.indice if c is not None else TOKEN for c in tab.linha_cor),
+        tuple(tab.linha_qtd),
+        tab.parede_bits,
+        tuple(TOKEN if az == "TOKEN" else az.indice for az in tab.piso),
+    )
+
+
+def _desserializar_tabuleiro(dados):
+    linha_cor, linha_qtd, parede_bits, piso = dados
+    tab = Tabuleiro()
+    for pos in range(25):
+        if parede_bits >> pos & 1:
+            r, c = divmod(pos, 5)
+            tab._colocar_na_parede(r, c, WALL_TEMPLATE[r][c].indice)
+    for i in range(5):
+        tab.restaurar_linha(i, ALL_COLORS[linha_cor[i]] if linha_cor[i] != TOKEN else None, linha_qtd[i])
+    tab.piso = ["TOKEN" if k == TOKEN else ALL_COLORS[k] for k in piso]
+    return tab
+
+
+def serializar_jogo(jogo):
+    """Estado do jogo como tupla aninhada de inteiros (barata de serializar com pickle)."""
+    dono = jogo.jogadores.index(jogo.owner_first_token) if jogo.owner_first_token is not None else TOKEN
+    return (
+        jogo.rodada,
+        tuple(e.contagem for e in jogo.expositores),
+        tuple(jogo.centro.contagem),
+        jogo.centro.token_primeiro,
+        dono,
+        tuple(jogo.saco.contagem),
+        tuple(jogo.saco.descarte),
+        tuple((j.pontos, _serializar_tabuleiro(j.tabuleiro)) for j in jogo.jogadores),
+    )
+
+
+def desserializar_jogo(dados, rng=None):
+    """Jogo equivalente ao serializado, com jogadores Jogador("J1".."Jn", tipo="cpu")."""
+    rodada, expositores, centro, token, dono, saco, descarte, jogadores = dados
+    lista = []
+    for i, (pontos, tab) in enumerate(jogadores):
+        jogador = Jogador(f"J{i + 1}", tipo="cpu")
+        jogador.pontos = pontos
+        jogador.tabuleiro = _desserializar_tabuleiro(tab)
+        lista.append(jogador)
+    jogo = Jogo(lista, rng=rng)
+    jogo.rodada = rodada
+    jogo.expositores = []
+    for i, contagem in enumerate(expositores):
+        e = Expositor(i + 1)
+        e.receber(tuple(contagem))
+        jogo.expositores.append(e)
+    jogo.centro = CentroMesa()
+    jogo.centro.adicionar_contagem(list(centro))
+    jogo.centro.token_primeiro = token
+    jogo.owner_first_token = lista[dono] if dono != TOKEN else None
+    jogo.saco = Saco(rng=jogo.saco.rng)
+    jogo.saco.contagem = list(saco)
+    jogo.saco.total = sum(saco)
+    jogo.saco.descarte = list(descarte)
+    jogo.hash = hash_jogo(jogo)
+    return jogo
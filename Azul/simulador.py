@@ -3,16 +3,44 @@
 Simula múltiplas partidas CPU x CPU usando os agentes do ai_agents.py
 Exemplo de uso:
     python simulator.py --games 50 --p1 greedy --p2 mcts
+    python simulator.py --games 200 --p1 greedy --p2 mcts --seed 1 --workers 8
+    python simulator.py --games 10000 --p1 cpu --p2 greedy --seed 1 --out sweep.jsonl --resume
+    python simulator.py --games 2000 --p1 greedy --p2 mcts --seed 1 --sprt --sprt-elo 30
+    python simulator.py --games 100 --p1 greedy --p2 cpu --seed 1 --paired
+    python simulator.py --games 4 --p1 greedy --p2 mcts --seed 1 --trace trace.json --profile sim.prof
+    python simulator.py --games 50 --p1 minimax --p2 mcts --seed 1 --time-budget 50
+    python simulator.py --games 20 --rating --agents cpu,greedy,minimax --seed 1
+    python simulator.py --games 20 --p1 greedy --p2 mcts --seed 1 --mcts-workers 4
+    python simulator.py --games 20 --p1 minimax --p2 greedy --seed 1 --minimax-depth 3 --minimax-workers 4
+    python simulator.py --games 100000 --p1 cpu --p2 cpu --seed 1 --batch --report-every 0
 """
 
 import argparse
+import cProfile
+import inspect
+import os
+import pstats
 import random
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations, islice
+from aleatorio import criar_rng, derivar_semente
 from jogo import Jogo
 from main import Jogador as JogadorMain  # se main.Jogador existe; sua classe Jogador real está em jogador.py -> import diferente
 # Para evitar confusão, import a classe Jogador base do seu modulo jogador
 from jogador import Jogador
 from ai_agents import GreedyAgent, MinimaxAgent, MCTSAgent, clone_game
 from jogo import Jogo
+from avaliacao import ConfrontoSequencial, TabelaRating
+from instrumentacao import ColetorDecisoes, HistogramaLatencia
+import rastreio
+from rastreio import ArquivoTrace
+from resultados import Agregado, GravadorResultados, ler_registros, resultado, resultado_de_a
 
 AGENTS_MAP = {
     "greedy": GreedyAgent,
@@ -21,39 +49,72 @@ AGENTS_MAP = {
     "cpu": Jogador,  # fallback: uso do Jogador padrão que já implementa _escolha_cpu
 }
 
-def criar_agente(nome_tipo, nome_instancia):
+TAMANHO_LOTE = 10000  # partidas simuladas juntas por run_games(lote=True)
+
+def criar_agente(nome_tipo, nome_instancia, rng=None, parametros=None):
+    """
+    parametros: argumentos extras para os agentes de IA (ex.: tempo_limite, limite_nos);
+    parametros[nome_tipo], se houver, é um dict com os argumentos só desse tipo
+    (ex.: {"mcts": {"processos": 4}}). Cada agente recebe só os que o seu construtor aceita.
+    """
     Tipo = AGENTS_MAP.get(nome_tipo.lower())
     if Tipo is None:
         raise ValueError(f"Tipo desconhecido: {nome_tipo}")
+    parametros = dict(parametros or {})
+    parametros.update(parametros.pop(nome_tipo.lower(), {}))
+    aceitos = inspect.signature(Tipo).parameters
+    parametros = {k: v for k, v in parametros.items() if k in aceitos}
     # para Jogador padrão, construa com tipo "cpu"
     if Tipo is Jogador:
-        return Jogador(nome_instancia, tipo="cpu")
+        return Jogador(nome_instancia, tipo="cpu", rng=rng)
     else:
         # instanciar com parâmetros padrão (pode ajustar)
         if Tipo is GreedyAgent:
-            return GreedyAgent(nome_instancia)
+            return GreedyAgent(nome_instancia, rng=rng, **parametros)
         if Tipo is MinimaxAgent:
-            return MinimaxAgent(nome_instancia)
+            return MinimaxAgent(nome_instancia, rng=rng, **parametros)
         if Tipo is MCTSAgent:
-            return MCTSAgent(nome_instancia)
-        return Tipo(nome_instancia, tipo="cpu")
+            return MCTSAgent(nome_instancia, rng=rng, **parametros)
+        return Tipo(nome_instancia, tipo="cpu", rng=rng, **parametros)
 
-def run_single_game(agent_types, seed=None, verbose=False):
+def run_single_game(agent_types, seed=None, verbose=False, detalhes=None, fluxos_agentes=None,
+                    instrumentacao=None, parametros=None):
     """
     agent_types: list of strings (ex: ["greedy","minimax"])
+    seed: semente da partida. O saco e cada agente recebem fluxos independentes derivados
+    dela (aleatorio.criar_rng), sem tocar no random global: a mesma semente reproduz a
+    partida mesmo com outras partidas rodando em paralelo.
+    detalhes: dict opcional preenchido com "pontos_por_rodada" (placar após cada rodada,
+    antes das bonificações finais) e "decisoes" (jogadas feitas por assento).
+    fluxos_agentes: índice do fluxo aleatório de cada assento (padrão: o próprio assento).
+    Nas partidas pareadas o agente leva o seu fluxo quando troca de assento; o saco usa
+    sempre o fluxo "jogo", que não depende de quem está sentado.
+    instrumentacao: gancho instalado em todos os jogadores (ver instrumentacao.py).
+    parametros: argumentos extras dos agentes de IA (ver criar_agente).
+    Com rastreio.ATIVO, a partida registra os trechos partida > rodada > coleta > turno.
     """
-    if seed is not None:
-        random.seed(seed)
+    if fluxos_agentes is None:
+        fluxos_agentes = range(len(agent_types))
     jogadores = []
-    for i, t in enumerate(agent_types):
-        jogadores.append(criar_agente(t, f"{t.upper()}_{i+1}"))
+    for i, (t, fluxo) in enumerate(zip(agent_types, fluxos_agentes)):
+        jogadores.append(criar_agente(t, f"{t.upper()}_{i+1}", rng=criar_rng(seed, "agente", fluxo),
+                                      parametros=parametros))
+    if instrumentacao is not None:
+        for jogador in jogadores:
+            jogador.instrumentacao = instrumentacao
 
-    jogo = Jogo(jogadores)
+    jogo = Jogo(jogadores, rng=criar_rng(seed, "jogo"))
     # Para que os agentes que precisam do objeto Jogo durante escolha_jogada possam acessá-lo,
     # alteramos temporariamente o processo de jogo para incluir "game" no estado passado a escolher_jogada.
     # Em Jogo.fase_coleta, estado contém expositores, centro, jogadores, indice_jogador, all_colors
     # Vamos rodar manualmente a fase de coleta aqui para injetar game no estado.
 
+    pontos_por_rodada = []
+    decisoes = [0] * len(jogadores)
+    rast = rastreio.ATIVO
+    if rast:
+        rast.abrir("partida", assentos=list(agent_types))
+        rast.abrir("rodada", rodada=1)
     jogo.preparar_rodada()
     # loop de rodadas até terminar
     while True:
@@ -66,62 +127,431 @@ def run_single_game(agent_types, seed=None, verbose=False):
             except ValueError:
                 start_idx = 0
 
+        if rast:
+            rast.abrir("coleta", rodada=jogo.rodada)
         turno_offset = 0
         while not jogo._todas_fontes_vazias():
-            jogador = jogo.jogadores[(start_idx + turno_offset) % len(jogo.jogadores)]
+            idx = (start_idx + turno_offset) % len(jogo.jogadores)
+            jogador = jogo.jogadores[idx]
+            if rast:
+                rast.abrir("turno", jogador=jogador.nome)
             estado = {
                 "expositores": jogo.expositores,
                 "centro": jogo.centro,
                 "jogadores": jogo.jogadores,
-                "indice_jogador": (start_idx + turno_offset) % len(jogo.jogadores),
+                "indice_jogador": idx,
                 "all_colors": jogo.all_colors,
                 "game": jogo  # injetado para agentes que o utilizam
             }
             escolha = jogador.escolher_jogada(estado)
-            if escolha is None:
-                turno_offset += 1
-                continue
-            jogo._aplicar_escolha(jogador, escolha)
+            if escolha is not None:
+                jogo._aplicar_escolha(jogador, escolha)
+                decisoes[idx] += 1
+            if rast:
+                rast.fechar("turno")
             turno_offset += 1
+        if rast:
+            rast.fechar("coleta")
 
         # fase parede e pontuação (usa game internamente)
         jogo.fase_parede_e_pontuacao()
+        pontos_por_rodada.append([j.pontos for j in jogo.jogadores])
+        if rast:
+            rast.fechar("rodada")
 
         # verificar fim de jogo (reutilizamos método)
         if jogo.jogo_terminou():
             break
 
         # preparar próxima rodada
+        if rast:
+            rast.abrir("rodada", rodada=jogo.rodada + 1)
         jogo.preparar_rodada()
 
     # fim de jogo
     jogo.aplicar_bonificacoes_finais()
+    if rast:
+        rast.fechar("partida")
+    if detalhes is not None:
+        detalhes["pontos_por_rodada"] = pontos_por_rodada
+        detalhes["decisoes"] = decisoes
     # retornar pontuação
     return [(j.nome, j.pontos) for j in jogo.jogadores]
 
+def semente_partida(seed, i):
+    """Semente da partida i derivada da semente mestra (None -> partida não reprodutível)."""
+    return None if seed is None else derivar_semente(seed, "partida", i)
+
+def _registro_partida(i, agent_types, seed, pareado, pontos, pontos_por_rodada, decisoes, tempo):
+    registro = {
+        "partida": i,
+        "semente": seed,
+        "assentos": list(agent_types),
+        "pontos": pontos,
+        "margem": pontos[0] - pontos[1],
+        "pontos_por_rodada": pontos_por_rodada,
+        "decisoes": decisoes,
+        "tempo_s": round(tempo, 4),
+    }
+    if pareado:
+        registro["par"] = i // 2
+        registro["trocado"] = i % 2 == 1
+    return registro
+
+def campos_registro(pareado=False):
+    """Campos dos registros de _registro_partida (as colunas de --out em CSV)."""
+    return list(_registro_partida(0, ["", ""], None, pareado, [0, 0], [], [], 0.0))
+
+def _jogar_partida(tarefa):
+    # função de topo (picklável) executada nos processos do pool
+    i, agent_types, seed, opcoes = tarefa
+    pareado = opcoes.get("pareado", False)
+    trocado = pareado and i % 2 == 1
+    detalhes = {}
+    coletor = ColetorDecisoes() if opcoes.get("instrumentar") else None
+    if opcoes.get("rastrear"):
+        rastreio.ligar(tid=i)
+    perfil = cProfile.Profile() if opcoes.get("perfil") else None
+    inicio = time.perf_counter()
+    try:
+        if perfil:
+            perfil.enable()
+        scores = run_single_game(agent_types, seed=seed, detalhes=detalhes,
+                                 fluxos_agentes=(1, 0) if trocado else None, instrumentacao=coletor,
+                                 parametros=opcoes.get("parametros"))
+    finally:
+        if perfil:
+            perfil.disable()
+        eventos = rastreio.desligar()
+    tempo = time.perf_counter() - inicio
+    registro = _registro_partida(i, agent_types, seed, pareado, [p for _, p in scores],
+                                 detalhes["pontos_por_rodada"], detalhes["decisoes"], tempo)
+    # campos extras abaixo são separados do registro pelo processo principal
+    if coletor:
+        registro["decisoes_detalhe"] = coletor.registros()
+    if opcoes.get("rastrear"):
+        registro["rastro"] = eventos
+    if perfil:
+        # estatísticas por partida num arquivo temporário, somadas em main (pstats.Stats.add)
+        caminho = os.path.join(opcoes["perfil"], f"partida{i}.prof")
+        perfil.dump_stats(caminho)
+        registro["perfil"] = caminho
+    return registro
+
+def _partidas_em_lote(tarefas):
+    """Registros de partidas cpu x cpu simuladas TAMANHO_LOTE por vez (partidas_lote.py)."""
+    # import tardio: NumPy só é necessário com --batch
+    from partidas_lote import jogar_partidas
+    while True:
+        bloco = list(islice(tarefas, TAMANHO_LOTE))
+        if not bloco:
+            return
+        if any(t != "cpu" for _, assentos, _, _ in bloco for t in assentos):
+            raise ValueError("partidas em lote só com jogadores cpu")
+        inicio = time.perf_counter()
+        resultados = jogar_partidas([semente for _, _, semente, _ in bloco], len(bloco[0][1]))
+        # o tempo é o do bloco inteiro, dividido entre as partidas
+        tempo = (time.perf_counter() - inicio) / len(bloco)
+        for (i, assentos, semente, opcoes), (pontos, pontos_por_rodada, decisoes) in zip(bloco, resultados):
+            yield _registro_partida(i, assentos, semente, opcoes["pareado"], pontos, pontos_por_rodada,
+                                    decisoes, tempo)
+
+def _ignorar_sigint():
+    # Ctrl-C é tratado só no processo principal, que cancela o que falta e encerra o pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def plano_partida(agent_types, i, seed, pareado=False):
+    """
+    (assentos, semente) da partida i. No modo pareado as partidas 2k e 2k+1 usam a mesma
+    semente (mesma sequência de azulejos) com os dois agentes em assentos trocados.
+    """
+    if callable(agent_types):
+        agent_types = agent_types(i)
+    if not pareado:
+        return list(agent_types), semente_partida(seed, i)
+    assentos = list(agent_types) if i % 2 == 0 else list(reversed(agent_types))
+    return assentos, semente_partida(seed, i // 2)
+
+def rodizio(tipos):
+    """
+    Assentos da partida i num todos-contra-todos entre `tipos`: os pares se alternam
+    partida a partida e, a cada volta completa, os assentos do par são trocados.
+    Retorna (função i -> assentos, número de pares).
+    """
+    pares = list(combinations(tipos, 2))
+    def assentos(i):
+        a, b = pares[i % len(pares)]
+        return [a, b] if (i // len(pares)) % 2 == 0 else [b, a]
+    return assentos, len(pares)
+
+def run_games(agent_types, games, seed=None, workers=1, ordered=True, pular=(), pareado=False,
+              instrumentar=False, rastrear=False, perfil=None, parametros=None, lote=False):
+    """
+    Joga `games` partidas e gera um registro (dict, ver _jogar_partida) por partida.
+    agent_types: tipos por assento, ou função i -> tipos da partida i (ver rodizio).
+    workers > 1 distribui as partidas num ProcessPoolExecutor; como cada partida só
+    depende da sua semente (semente_partida), os resultados são os mesmos da execução serial.
+    ordered=False entrega na ordem de término (útil para acompanhar o progresso).
+    pular: índices de partidas já jogadas (--resume), que não são jogadas de novo.
+    pareado: cada semente é jogada duas vezes, com os assentos trocados (ver plano_partida).
+    instrumentar: o registro traz "decisoes_detalhe", um dict por decisão (ColetorDecisoes).
+    rastrear: o registro traz "rastro", os eventos Chrome trace da partida (rastreio.py).
+    perfil: pasta onde cada partida grava o seu cProfile; o registro traz o caminho em "perfil".
+    parametros: argumentos extras dos agentes de IA (ver criar_agente).
+    lote: partidas só entre jogadores cpu, simuladas em lote num processo (partidas_lote.py),
+    com os mesmos pontos da simulação objeto a objeto; ignora workers.
+    Só 2*workers partidas ficam submetidas por vez, então a memória não cresce com `games`.
+    """
+    opcoes = {"pareado": pareado, "instrumentar": instrumentar, "rastrear": rastrear, "perfil": perfil,
+              "parametros": parametros}
+    tarefas = ((i, *plano_partida(agent_types, i, seed, pareado), opcoes)
+               for i in range(games) if i not in pular)
+    if lote:
+        yield from _partidas_em_lote(tarefas)
+        return
+    if workers <= 1:
+        for tarefa in tarefas:
+            yield _jogar_partida(tarefa)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_ignorar_sigint)
+    pendentes = deque(pool.submit(_jogar_partida, t) for t in islice(tarefas, 2 * workers))
+    try:
+        if ordered:
+            while pendentes:
+                registro = pendentes.popleft().result()
+                for tarefa in islice(tarefas, 1):
+                    pendentes.append(pool.submit(_jogar_partida, tarefa))
+                yield registro
+        else:
+            pendentes = set(pendentes)
+            while pendentes:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for tarefa in islice(tarefas, len(prontos)):
+                    pendentes.add(pool.submit(_jogar_partida, tarefa))
+                for futuro in prontos:
+                    yield futuro.result()
+    except KeyboardInterrupt:
+        em_andamento = sum(1 for f in pendentes if f.running())
+        print(f"\nInterrompido: cancelando partidas pendentes (aguardando {em_andamento} em andamento)...")
+        raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def partidas_gravadas(caminho, agent_types, seed, pareado=False):
+    """
+    Registros de --out que pertencem a esta rodada (mesma semente mestra e mesmos agentes),
+    para o --resume pular essas partidas e somá-las ao resumo.
+    """
+    if not os.path.exists(caminho):
+        return
+    for registro in ler_registros(caminho):
+        i = registro.get("partida")
+        if not isinstance(i, int) or ("trocado" in registro) != pareado:
+            continue
+        esperado, semente = plano_partida(agent_types, i, seed, pareado)
+        if registro.get("semente") != semente:
+            continue
+        if registro.get("assentos") != esperado:
+            raise SystemExit(f"{caminho}: partida {i} foi jogada com {registro.get('assentos')}, "
+                             f"não {esperado}")
+        yield registro
+
+def parametros_agentes(args):
+    parametros = {}
+    if args.time_budget is not None:
+        parametros["tempo_limite"] = args.time_budget / 1000
+    if args.node_budget is not None:
+        parametros["limite_nos"] = args.node_budget
+    if args.mcts_workers > 1:
+        parametros["mcts"] = {"processos": args.mcts_workers}
+    if args.minimax_workers > 1:
+        parametros["minimax"] = {"processos": args.minimax_workers}
+    if args.minimax_depth is not None:
+        parametros.setdefault("minimax", {})["depth"] = args.minimax_depth
+    return parametros
+
 def parse_args():
     p = argparse.ArgumentParser()
     p.add_argument("--games", type=int, default=10, help="Qtd de partidas")
     p.add_argument("--p1", type=str, default="greedy")
     p.add_argument("--p2", type=str, default="mcts")
     p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--workers", type=int, default=1, help="Processos em paralelo (1 = serial)")
+    p.add_argument("--unordered", action="store_true",
+                   help="Com --workers, mostrar resultados na ordem em que as partidas terminam")
+    p.add_argument("--out", type=str, default=None,
+                   help="Arquivo .jsonl ou .csv onde cada partida é gravada assim que termina")
+    p.add_argument("--format", choices=["jsonl", "csv"], default=None,
+                   help="Formato de --out (padrão: pela extensão)")
+    p.add_argument("--resume", action="store_true",
+                   help="Continuar --out: pula as partidas (sementes) que já estão no arquivo")
+    p.add_argument("--report-every", type=int, default=10,
+                   help="Mostrar o resumo corrente a cada N partidas (0 = só no fim)")
+    p.add_argument("--sprt", action="store_true",
+                   help="Parar assim que o SPRT decidir (--games vira o máximo de partidas)")
+    p.add_argument("--sprt-elo", type=float, default=50.0,
+                   help="Diferença de Elo que o SPRT deve detectar (menor que isso = equivalentes)")
+    p.add_argument("--sprt-alpha", type=float, default=0.05)
+    p.add_argument("--sprt-beta", type=float, default=0.05)
+    p.add_argument("--paired", action="store_true",
+                   help="Jogar cada semente duas vezes com os assentos trocados (--games = pares)")
+    p.add_argument("--time-budget", type=float, default=None,
+                   help="Tempo máximo por jogada dos agentes de IA, em milissegundos")
+    p.add_argument("--node-budget", type=int, default=None,
+                   help="Máximo de nós/jogadas simuladas por jogada dos agentes de IA")
+    p.add_argument("--mcts-workers", type=int, default=1,
+                   help="Processos por decisão do MCTS (busca paralela na raiz; 1 = serial)")
+    p.add_argument("--minimax-workers", type=int, default=1,
+                   help="Processos por decisão do Minimax sem orçamento (opções da raiz em paralelo)")
+    p.add_argument("--minimax-depth", type=int, default=None,
+                   help="Profundidade do Minimax sem orçamento (padrão do agente: 2)")
+    p.add_argument("--decisions-out", type=str, default=None,
+                   help="Arquivo .jsonl com um registro por decisão (tempo e contadores do agente)")
+    p.add_argument("--latency-histogram", action="store_true",
+                   help="Mostrar no fim o histograma de latência por decisão de cada agente")
+    p.add_argument("--trace", type=str, default=None,
+                   help="Arquivo .json com os trechos de cada partida no formato Chrome trace")
+    p.add_argument("--profile", type=str, default=None,
+                   help="Rodar as partidas sob cProfile e salvar as estatísticas somadas neste arquivo")
+    p.add_argument("--rating", action="store_true",
+                   help="Todos contra todos entre --agents (padrão: todos de AGENTS_MAP), "
+                        "--games partidas por par, com ratings Elo")
+    p.add_argument("--agents", type=str, default=None,
+                   help="Tipos para --rating, separados por vírgula")
+    p.add_argument("--batch", action="store_true",
+                   help="Simular as partidas cpu x cpu em lote com NumPy (mesmos pontos, bem mais rápido)")
     return p.parse_args()
 
-if __name__ == "__main__":
+def main():
     args = parse_args()
-    results = []
-    for i in range(args.games):
-        seed = None if args.seed is None else args.seed + i
-        scores = run_single_game([args.p1, args.p2], seed=seed)
-        results.append(scores)
-        print(f"Game {i+1}: {scores}")
-    # sumarizar
-    wins = {args.p1:0, args.p2:0, "tie":0}
-    for s in results:
-        if s[0][1] > s[1][1]:
-            wins[args.p1] += 1
-        elif s[1][1] > s[0][1]:
-            wins[args.p2] += 1
-        else:
-            wins["tie"] += 1
-    print("Resumo:", wins)
+    if args.resume and (args.out is None or args.seed is None):
+        raise SystemExit("--resume exige --out e --seed (as partidas são identificadas pela semente)")
+    if args.rating and (args.sprt or args.paired):
+        raise SystemExit("--rating não pode ser usado com --sprt nem com --paired")
+    if args.batch and (args.rating or {args.p1, args.p2} != {"cpu"}):
+        raise SystemExit("--batch só simula partidas cpu x cpu (--p1 cpu --p2 cpu)")
+    if args.batch and (args.workers > 1 or args.decisions_out or args.latency_histogram
+                       or args.trace or args.profile):
+        raise SystemExit("--batch roda num processo só e não tem --decisions-out, "
+                         "--latency-histogram, --trace nem --profile")
+    if args.paired and args.seed is None:
+        # as duas partidas do par precisam da mesma semente; sem --seed, sorteia a mestra
+        args.seed = random.SystemRandom().getrandbits(63)
+        print(f"--paired sem --seed: usando --seed {args.seed}")
+    if args.rating:
+        tipos = args.agents.split(",") if args.agents else list(AGENTS_MAP)
+        desconhecidos = [t for t in tipos if t not in AGENTS_MAP]
+        if desconhecidos or len(tipos) < 2:
+            raise SystemExit(f"--agents precisa de 2+ tipos de {list(AGENTS_MAP)}; inválidos: {desconhecidos}")
+        agent_types, n_pares = rodizio(tipos)
+        total = args.games * n_pares
+        tabela = TabelaRating(tipos)
+        sequencial = None
+        def contabilizar(registro):
+            a, b = registro["assentos"]
+            tabela.adicionar(a, b, resultado(registro))
+        relatorio = tabela.tabela
+    else:
+        agent_types = [args.p1, args.p2]
+        total = 2 * args.games if args.paired else args.games
+        agregado = Agregado(args.p1, args.p2)
+        sequencial = (ConfrontoSequencial(agregado.a, agregado.b, args.sprt_elo,
+                                          args.sprt_alpha, args.sprt_beta) if args.sprt else None)
+        def contabilizar(registro):
+            agregado.adicionar(registro)
+            if sequencial:
+                sequencial.adicionar(resultado_de_a(registro)[0])
+        def relatorio():
+            return agregado.resumo() + (f"\n   {sequencial.resumo()}" if sequencial else "")
+
+    feitas = set()
+    if args.resume:
+        for registro in partidas_gravadas(args.out, agent_types, args.seed, args.paired):
+            if registro["partida"] not in feitas and registro["partida"] < total:
+                feitas.add(registro["partida"])
+                contabilizar(registro)
+        print(f"Retomando: {len(feitas)} de {total} partidas já em {args.out}")
+    decisao = sequencial.decisao() if sequencial else None
+    # conferir as colunas de um CSV retomado antes de jogar (--paired acrescenta par e trocado)
+    gravador = (GravadorResultados(args.out, args.format, retomar=args.resume, campos=campos_registro(args.paired))
+                if args.out else None)
+    # contadores variam de agente para agente, por isso decisões vão sempre em JSONL
+    gravador_decisoes = (GravadorResultados(args.decisions_out, "jsonl", retomar=args.resume)
+                         if args.decisions_out else None)
+    histogramas = {} if args.latency_histogram else None
+    trace = ArquivoTrace(args.trace) if args.trace else None
+    pasta_perfil = tempfile.mkdtemp(prefix="perfil_") if args.profile else None
+    estatisticas = None
+    jogadas = 0
+    interrompido = False
+    try:
+        # no modo SPRT as partidas são consumidas em ordem, para a parada não depender
+        # de qual processo terminou primeiro
+        partidas = run_games(agent_types, total, seed=args.seed, workers=args.workers,
+                             ordered=not args.unordered or args.sprt, pular=feitas,
+                             pareado=args.paired,
+                             instrumentar=bool(gravador_decisoes or histogramas is not None),
+                             rastrear=bool(trace), perfil=pasta_perfil,
+                             parametros=parametros_agentes(args), lote=args.batch)
+        for registro in (() if decisao else partidas):
+            if trace:
+                trace.gravar(registro.pop("rastro"))
+            if pasta_perfil:
+                caminho = registro.pop("perfil")
+                if estatisticas is None:
+                    estatisticas = pstats.Stats(caminho)
+                else:
+                    estatisticas.add(caminho)
+                os.remove(caminho)
+            for d in registro.pop("decisoes_detalhe", ()):
+                d["partida"] = registro["partida"]
+                if gravador_decisoes:
+                    gravador_decisoes.gravar(d)
+                if histogramas is not None:
+                    tipo = registro["assentos"][d["assento"]]
+                    histogramas.setdefault(tipo, HistogramaLatencia()).adicionar(d["tempo_ms"])
+            if gravador:
+                gravador.gravar(registro)
+            contabilizar(registro)
+            jogadas += 1
+            nomes = [f"{t.upper()}_{k+1}" for k, t in enumerate(registro["assentos"])]
+            print(f"Game {registro['partida']+1}: {list(zip(nomes, registro['pontos']))}")
+            if args.report_every and jogadas % args.report_every == 0:
+                print("  ", relatorio())
+            # com --paired, o SPRT só decide com o par completo (partida ímpar)
+            if sequencial and (not args.paired or registro["partida"] % 2 == 1):
+                decisao = sequencial.decisao()
+                if decisao:
+                    break
+        partidas.close()
+    except KeyboardInterrupt:
+        interrompido = True
+        print(f"Resumo parcial ({len(feitas) + jogadas} de {total} partidas):")
+    finally:
+        for g in (gravador, gravador_decisoes, trace):
+            if g:
+                g.fechar()
+        if pasta_perfil:
+            shutil.rmtree(pasta_perfil, ignore_errors=True)
+    if args.rating:
+        print("Ratings:")
+        print(tabela.tabela())
+    else:
+        print("Resumo:", agregado.vitorias)
+        print(relatorio())
+        if args.sprt:
+            print("SPRT:", decisao or f"sem decisão em {agregado.n} partidas")
+    if estatisticas:
+        estatisticas.dump_stats(args.profile)
+        print(f"Perfil ({args.profile}), 25 funções com maior tempo acumulado:")
+        estatisticas.sort_stats("cumulative").print_stats(25)
+    if histogramas:
+        for tipo, histograma in histogramas.items():
+            print(f"Latência por decisão ({tipo}):")
+            print(histograma.texto())
+    if interrompido:
+        sys.exit(130)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 # tabuleiro.py
-from azulejos import CorAzulejo
+from azulejos import CorAzulejo, ALL_COLORS
+from score import PONTOS_COLOCACAO, bonus_da_colocacao
 
 FLOOR_PENALTIES = [-1, -1, -2, -2, -2, -3, -3]  # penalidades do piso (máx 7 posições)
+# PENALIDADE_PISO[n]: penalidade total com n peças no piso (n limitado a 7)
+PENALIDADE_PISO = [sum(FLOOR_PENALTIES[:n]) for n in range(len(FLOOR_PENALTIES) + 1)]
 
 # WALL_TEMPLATE define qual cor "cabe" em cada posição da parede por linha
 # (padrão clássico do Azul)
@@ -19,48 +22,131 @@ WALL_TEMPLATE = [
     [Y, R, K, W, B],
 ]
 
+# Representação compacta da parede:
+# - bit (linha*5 + coluna) de `parede_bits` indica se a posição está ocupada;
+# - cores_linha[linha] é uma máscara com o bit `cor.indice` ligado para cada cor já na linha.
+# COLUNA_DA_COR[linha][cor.indice] -> coluna da parede onde a cor fica naquela linha.
+COLUNA_DA_COR = [[WALL_TEMPLATE[r].index(cor) for cor in ALL_COLORS] for r in range(5)]
+MASCARA_LINHA = 0b11111
+
+
 class Tabuleiro:
+    __slots__ = ("linha_cor", "linha_qtd", "parede_bits", "cores_linha", "mascara_colunas",
+                 "cont_linhas", "cont_colunas", "cont_cores", "linhas_completas", "bonus_final",
+                 "linhas_para_cor", "piso")
+
     def __init__(self):
-        # linhas de padrão: índices 0..4 com capacidades 1..5
-        self.linhas = [[] for _ in range(5)]
-        # parede 5x5 (None ou CorAzulejo)
-        self.parede = [[None]*5 for _ in range(5)]
+        # linhas de padrão: índices 0..4 com capacidades 1..5, guardadas como pares (cor, quantidade)
+        self.linha_cor = [None] * 5
+        self.linha_qtd = [0] * 5
+        # parede 5x5 como inteiro de 25 bits + máscara de cores por linha
+        self.parede_bits = 0
+        self.cores_linha = [0] * 5
+        # mascara_colunas[c]: bit r ligado se (r, c) ocupada (ocupação da coluna, para score.PONTOS_COLOCACAO)
+        self.mascara_colunas = [0] * 5
+        # contadores de peças por linha/coluna/cor da parede, atualizados a cada colocação;
+        # com eles o fim de jogo e o bônus final não precisam varrer a parede
+        self.cont_linhas = [0] * 5
+        self.cont_colunas = [0] * 5
+        self.cont_cores = [0] * 5
+        self.linhas_completas = 0
+        self.bonus_final = 0
+        # linhas_para_cor[cor.indice]: máscara (bit = linha) das linhas padrão que aceitam a cor agora;
+        # mantida a cada mudança de linha/parede, é o que o gerador de jogadas (movimentos.py) consulta
+        self.linhas_para_cor = [MASCARA_LINHA] * 5
         # piso: lista de azulejos (ou marcador "TOKEN")
         self.piso = []
 
+    def clonar(self):
+        """Cópia independente do tabuleiro (mais barata que copy.deepcopy)."""
+        novo = Tabuleiro.__new__(Tabuleiro)
+        novo.linha_cor = self.linha_cor[:]
+        novo.linha_qtd = self.linha_qtd[:]
+        novo.parede_bits = self.parede_bits
+        novo.cores_linha = self.cores_linha[:]
+        novo.mascara_colunas = self.mascara_colunas[:]
+        novo.cont_linhas = self.cont_linhas[:]
+        novo.cont_colunas = self.cont_colunas[:]
+        novo.cont_cores = self.cont_cores[:]
+        novo.linhas_completas = self.linhas_completas
+        novo.bonus_final = self.bonus_final
+        novo.linhas_para_cor = self.linhas_para_cor[:]
+        novo.piso = self.piso[:]
+        return novo
+
+    @property
+    def linhas(self):
+        """Visão (somente leitura) das linhas padrão como listas de azulejos."""
+        return [[self.linha_cor[i]] * self.linha_qtd[i] for i in range(5)]
+
+    @property
+    def parede(self):
+        """Visão (somente leitura) da parede 5x5 (None ou CorAzulejo)."""
+        bits = self.parede_bits
+        return [[WALL_TEMPLATE[r][c] if bits >> (r * 5 + c) & 1 else None for c in range(5)]
+                for r in range(5)]
+
     def capacidade_linha(self, idx):
         return idx + 1
 
     def pode_colocar_na_linha(self, linha_idx, cor):
-        linha = self.linhas[linha_idx]
-        # se linha já tem cor diferente -> não pode
-        if len(linha) > 0 and any(a != cor for a in linha):
-            return False
-        # se cor já presente na mesma linha na parede -> não pode
-        for c in range(5):
-            if self.parede[linha_idx][c] == cor:
-                return False
-        # se linha já cheia -> não pode
-        return len(linha) < self.capacidade_linha(linha_idx)
+        # não pode se a linha já tem cor diferente, se a cor já está nessa linha da parede
+        # ou se a linha já está cheia (ver _atualizar_permitidas)
+        return bool(self.linhas_para_cor[cor.indice] >> linha_idx & 1)
+
+    def _atualizar_permitidas(self, linha_idx):
+        """Recalcula o bit linha_idx de linhas_para_cor para as 5 cores."""
+        bit = 1 << linha_idx
+        qtd = self.linha_qtd[linha_idx]
+        na_parede = self.cores_linha[linha_idx]
+        permitidas = self.linhas_para_cor
+        for k in range(5):
+            permitidas[k] &= ~bit
+        if qtd > linha_idx:
+            return  # linha cheia
+        if qtd:
+            k = self.linha_cor[linha_idx].indice
+            if not na_parede >> k & 1:
+                permitidas[k] |= bit
+        else:
+            for k in range(5):
+                if not na_parede >> k & 1:
+                    permitidas[k] |= bit
+
+    def restaurar_linha(self, linha_idx, cor, qtd):
+        """Volta a linha padrão para (cor, qtd) — usado por Jogo.desfazer."""
+        self.linha_cor[linha_idx] = cor
+        self.linha_qtd[linha_idx] = qtd
+        self._atualizar_permitidas(linha_idx)
 
     def adicionar_a_linha(self, linha_idx, azulejos, to_floor_if_excess=True):
         """
         Adiciona azulejos à linha padrão; excesso vai para o piso.
         Retorna lista de azulejos que foram para o piso.
         """
-        capacidade = self.capacidade_linha(linha_idx)
-        linha = self.linhas[linha_idx]
-        espaço = capacidade - len(linha)
-        if espaço >= len(azulejos):
-            self.linhas[linha_idx] += azulejos
+        if not azulejos:
             return []
-        else:
-            para_linha = azulejos[:espaço]
-            excesso = azulejos[espaço:]
-            self.linhas[linha_idx] += para_linha
-            if to_floor_if_excess:
-                self.piso += excesso
-            return excesso
+        excesso = self.adicionar_qtd(linha_idx, azulejos[0], len(azulejos), to_floor_if_excess)
+        return [azulejos[0]] * excesso
+
+    def adicionar_qtd(self, linha_idx, cor, n, to_floor_if_excess=True):
+        """
+        Versão por contagem de adicionar_a_linha: coloca n azulejos da cor na linha.
+        Retorna quantos sobraram (e foram para o piso, se to_floor_if_excess).
+        """
+        if not n:
+            return 0
+        espaço = self.capacidade_linha(linha_idx) - self.linha_qtd[linha_idx]
+        self.linha_cor[linha_idx] = cor
+        if espaço >= n:
+            self.linha_qtd[linha_idx] += n
+            self._atualizar_permitidas(linha_idx)
+            return 0
+        self.linha_qtd[linha_idx] += espaço
+        self._atualizar_permitidas(linha_idx)
+        if to_floor_if_excess:
+            self.piso += [cor] * (n - espaço)
+        return n - espaço
 
     def finalizar_rodada(self):
         """
@@ -71,32 +157,17 @@ class Tabuleiro:
         para_descarte = []
         for i in range(5):
             capacidade = self.capacidade_linha(i)
-            if len(self.linhas[i]) == capacidade:
-                cor = self.linhas[i][0]
-                # achar coluna alvo na parede via WALL_TEMPLATE
-                target_col = None
-                for col in range(5):
-                    if WALL_TEMPLATE[i][col] == cor:
-                        target_col = col
-                        break
-                if target_col is None:
-                    # fallback: primeiro livre
-                    for col in range(5):
-                        if self.parede[i][col] is None:
-                            target_col = col
-                            break
-                # colocar um azulejo na parede
-                self.parede[i][target_col] = cor
+            if self.linha_qtd[i] == capacidade:
+                cor = self.linha_cor[i]
+                # coluna alvo na parede via WALL_TEMPLATE
+                target_col = COLUNA_DA_COR[i][cor.indice]
+                # colocar um azulejo na parede e calcular pontos pela colocação
+                pontos += self._colocar_na_parede(i, target_col, cor.indice)
                 # o restante (capacidade - 1) vão para descarte
-                descarte = self.linhas[i][1:]
-                para_descarte += descarte
-                self.linhas[i] = []
-                # calcular pontos pela colocação
-                ganhos = self._calcular_pontos_posicao(i, target_col)
-                pontos += ganhos
-            else:
-                # linhas incompletas permanecem
-                pass
+                para_descarte += [cor] * (capacidade - 1)
+                self.linha_cor[i] = None
+                self.linha_qtd[i] = 0
+                self._atualizar_permitidas(i)
 
         # penalidades do piso
         penalty = 0
@@ -109,51 +180,56 @@ class Tabuleiro:
         self.piso = []
         return pontos + penalty, para_descarte
 
+    def pontos_fim_rodada(self):
+        """
+        Pontos que finalizar_rodada() daria agora (colocações + piso), sem alterar o tabuleiro.
+        Usado pelas simulações dos agentes, que não podem mexer no saco nem limpar as linhas.
+        """
+        pontos = PENALIDADE_PISO[min(len(self.piso), len(FLOOR_PENALTIES))]
+        bits = self.parede_bits
+        colunas = None
+        for i in range(5):
+            if self.linha_qtd[i] == i + 1:
+                col = COLUNA_DA_COR[i][self.linha_cor[i].indice]
+                if colunas is None:
+                    colunas = self.mascara_colunas[:]
+                pontos += PONTOS_COLOCACAO[i * 5 + col][(bits >> (i * 5)) & MASCARA_LINHA][colunas[col]]
+                bits |= 1 << (i * 5 + col)
+                colunas[col] |= 1 << i
+        return pontos
+
+    def _colocar_na_parede(self, row, col, cor_idx):
+        """Ocupa (row, col) com a cor de índice cor_idx, atualiza os contadores e retorna os pontos."""
+        pontos = self._calcular_pontos_posicao(row, col)
+        self.parede_bits |= 1 << (row * 5 + col)
+        self.cores_linha[row] |= 1 << cor_idx
+        self.mascara_colunas[col] |= 1 << row
+        self.cont_linhas[row] += 1
+        self.cont_colunas[col] += 1
+        self.cont_cores[cor_idx] += 1
+        if self.cont_linhas[row] == 5:
+            self.linhas_completas += 1
+        self.bonus_final += bonus_da_colocacao(self.cont_linhas[row], self.cont_colunas[col],
+                                               self.cont_cores[cor_idx])
+        self._atualizar_permitidas(row)
+        return pontos
+
     def _calcular_pontos_posicao(self, row, col):
-        base = 1
-        horiz = 0
-        # esquerda
-        c = col - 1
-        while c >= 0 and self.parede[row][c] is not None:
-            horiz += 1
-            c -= 1
-        # direita
-        c = col + 1
-        while c < 5 and self.parede[row][c] is not None:
-            horiz += 1
-            c += 1
-
-        vert = 0
-        r = row - 1
-        while r >= 0 and self.parede[r][col] is not None:
-            vert += 1
-            r -= 1
-        r = row + 1
-        while r < 5 and self.parede[r][col] is not None:
-            vert += 1
-            r += 1
-
-        if horiz == 0 and vert == 0:
-            return base
-        else:
-            return base + horiz + vert
+        mascara_linha = (self.parede_bits >> (row * 5)) & MASCARA_LINHA
+        return PONTOS_COLOCACAO[row * 5 + col][mascara_linha][self.mascara_colunas[col]]
+
+    def tem_linha_completa(self):
+        return self.linhas_completas > 0
+
+    def pecas_na_parede(self):
+        return self.parede_bits.bit_count()
+
+    def pecas_nas_linhas(self):
+        return sum(self.linha_qtd)
 
     def pontuacao_final_bonificacoes(self):
-        bonus = 0
-        # linhas completas
-        for r in range(5):
-            if all(self.parede[r][c] is not None for c in range(5)):
-                bonus += 2
-        # colunas completas
-        for c in range(5):
-            if all(self.parede[r][c] is not None for r in range(5)):
-                bonus += 7
-        # cores completas
-        for cor in [CorAzulejo.AZUL, CorAzulejo.AMARELO, CorAzulejo.VERMELHO, CorAzulejo.PRETO, CorAzulejo.BRANCO]:
-            cnt = sum(1 for r in range(5) for cc in range(5) if self.parede[r][cc] == cor)
-            if cnt == 5:
-                bonus += 10
-        return bonus
+        # linhas (+2), colunas (+7) e cores (+10) completas, acumuladas em _colocar_na_parede
+        return self.bonus_final
 
     def __str__(self):
         s = "Linhas padrão:\n"
@@ -161,6 +237,7 @@ class Tabuleiro:
             s += f" {i+1} [{len(l)}/{self.capacidade_linha(i)}]: " + " ".join(str(x.value) for x in l) + "\n"
         s += "Piso: " + " ".join(str(x) for x in self.piso) + "\n"
         s += "Parede:\n"
+        parede = self.parede
         for r in range(5):
-            s += " ".join(self.parede[r][c].value if self.parede[r][c] else "." for c in range(5)) + "\n"
+            s += " ".join(parede[r][c].value if parede[r][c] else "." for c in range(5)) + "\n"
         return s
@@ -0,0 +1,40 @@
+# transposicao.py
+"""
+Tabela de transposição limitada para a busca do MinimaxAgent.
+Cada entrada guarda (profundidade, valor, tipo do limite, melhor opção) indexada pela
+chave Zobrist da posição (ver zobrist.py).
+"""
+
+EXATO = 0
+LIMITE_INFERIOR = 1  # valor real >= valor guardado (corte beta)
+LIMITE_SUPERIOR = 2  # valor real <= valor guardado (nenhuma opção passou de alpha)
+
+
+class TabelaTransposicao:
+    def __init__(self, max_entradas=200_000):
+        self.max_entradas = max_entradas
+        self.entradas = {}
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def buscar(self, chave):
+        """Retorna (profundidade, valor, tipo, melhor) ou None."""
+        return self.entradas.get(chave)
+
+    def guardar(self, chave, profundidade, valor, tipo, melhor=None):
+        entradas = self.entradas
+        antiga = entradas.get(chave)
+        if antiga is not None:
+            # preferir a busca mais profunda
+            if antiga[0] > profundidade:
+                return
+        elif len(entradas) >= self.max_entradas:
+            if not entradas:
+                return  # max_entradas=0: tabela desligada
+            # tabela cheia: descarta a entrada mais antiga (dict mantém a ordem de inserção)
+            del entradas[next(iter(entradas))]
+        entradas[chave] = (profundidade, valor, tipo, melhor)
+
+    def limpar(self):
+        self.entradas.clear()
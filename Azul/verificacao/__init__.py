@@ -0,0 +1,8 @@
+# verificacao/__init__.py
+"""
+Verificações de equivalência das versões rápidas contra as de referência (o motor
+objeto a objeto). Cada módulo confere uma otimização e para na primeira diferença.
+Rodar a partir da pasta Azul/, por exemplo:
+    python -m verificacao
+    python -m verificacao.gulosa --partidas 50
+"""
@@ -0,0 +1,26 @@
+# verificacao/__main__.py
+"""
+Roda todas as verificações (python -m verificacao, da pasta Azul/).
+Sai com código 1 na primeira diferença encontrada.
+"""
+
+import argparse
+import sys
+from verificacao import gulosa, partidas, rodadas_lote
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    try:
+        print(f"escolha_gulosa: {gulosa.verificar(seed=args.seed)} posições ok")
+        print(f"LoteRodadas: {rodadas_lote.verificar(seed=args.seed)} posições ok")
+        print(f"jogar_partidas: {partidas.verificar(seed=args.seed)} partidas ok")
+    except AssertionError as e:
+        print(f"FALHOU: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# verificacao/gulosa.py
+"""
+ai_agents.escolha_gulosa (variação da avaliação calculada direto do estado) contra a
+definição: aplicar cada jogada, avaliar_jogo_simples, desfazer; a primeira de maior ganho.
+Uso: python -m verificacao.gulosa [--partidas N] [--seed S]
+"""
+
+import argparse
+from ai_agents import avaliar_jogo_simples, escolha_gulosa
+from movimentos import listar_movimentos
+from verificacao.posicoes import posicoes
+
+
+def referencia(jogo, idx, jogadas):
+    base = avaliar_jogo_simples(jogo, idx)
+    melhor, melhor_valor = None, -float("inf")
+    for jogada in jogadas:
+        registro = jogo.aplicar_movimento(idx, jogada)
+        valor = avaliar_jogo_simples(jogo, idx) - base
+        jogo.desfazer(registro)
+        if valor > melhor_valor:
+            melhor, melhor_valor = jogada, valor
+    return melhor
+
+
+def verificar(partidas=30, seed=0):
+    """Confere a escolha em cada posição; retorna quantas foram conferidas."""
+    n = 0
+    for n_jogadores in (2, 3, 4):
+        for jogo, idx in posicoes(partidas, seed, n_jogadores):
+            jogadas = listar_movimentos(jogo, idx)
+            esperada = referencia(jogo, idx, jogadas)
+            obtida = escolha_gulosa(jogo, idx, jogadas)
+            if obtida != esperada:
+                raise AssertionError(f"escolha_gulosa: {obtida} != {esperada} ({n_jogadores} jogadores, "
+                                     f"rodada {jogo.rodada}, vez {idx}, jogadas {jogadas})")
+            n += 1
+    return n
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--partidas", type=int, default=30, help="Partidas por número de jogadores")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    print(f"escolha_gulosa: {verificar(args.partidas, args.seed)} posições ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# verificacao/partidas.py
+"""
+partidas_lote.jogar_partidas contra simulador.run_single_game(["cpu"] * n, seed): pontos
+finais, pontos por rodada e decisões por assento de cada partida, com 2, 3 e 4 jogadores.
+Antes, o Mersenne Twister vetorizado (partidas_lote._GeradoresMT) contra random.Random
+direto, com sementes nas bordas de 32 e 64 bits: uma mudança no sorteio de
+Saco.puxar_rodada ou na semeadura do CPython aparece aqui.
+Uso: python -m verificacao.partidas [--partidas N] [--seed S]
+"""
+
+import argparse
+import random
+import numpy as np
+from partidas_lote import _GeradoresMT, jogar_partidas
+from simulador import run_single_game, semente_partida
+
+SEMENTES_BORDA = [0, 1, 2**32 - 1, 2**32, 2**32 + 1, 2**63, 2**64 - 1]
+
+
+def verificar_geradores(passos=2000, seed=0):
+    """randrange(n) de _GeradoresMT contra random.Random; passa por várias renovações do estado."""
+    rng = random.Random(seed)
+    sementes = SEMENTES_BORDA + [rng.getrandbits(64) for _ in range(20)] + [rng.getrandbits(20) for _ in range(5)]
+    geradores = _GeradoresMT(sementes)
+    referencias = [random.Random(s) for s in sementes]
+    todos = np.arange(len(sementes))
+    for _ in range(passos):
+        # nem toda partida sorteia em todo passo, como no saco
+        g = todos[[rng.random() < 0.7 for _ in todos]]
+        n = np.array([rng.randrange(1, 101) for _ in g], dtype=np.int64)
+        for gi, ni, r in zip(g, n, geradores.abaixo(g, n)):
+            esperado = referencias[gi].randrange(int(ni))
+            if r != esperado:
+                raise AssertionError(f"randrange({ni}) com semente {sementes[gi]}: {r} != {esperado}")
+    return len(sementes)
+
+
+def verificar(partidas=40, seed=0):
+    """Confere as partidas em lote; retorna quantas foram conferidas."""
+    verificar_geradores(seed=seed)
+    n = 0
+    sementes = SEMENTES_BORDA + [semente_partida(seed, i) for i in range(partidas)]
+    for n_jogadores in (2, 3, 4):
+        for s, (pontos, por_rodada, decisoes) in zip(sementes, jogar_partidas(sementes, n_jogadores)):
+            detalhes = {}
+            esperado = [p for _, p in run_single_game(["cpu"] * n_jogadores, seed=s, detalhes=detalhes)]
+            obtido = (pontos, por_rodada, decisoes)
+            if obtido != (esperado, detalhes["pontos_por_rodada"], detalhes["decisoes"]):
+                raise AssertionError(f"partida com semente {s}, {n_jogadores} jogadores: {obtido} != "
+                                     f"{(esperado, detalhes['pontos_por_rodada'], detalhes['decisoes'])}")
+            n += 1
+    return n
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--partidas", type=int, default=40, help="Partidas por número de jogadores")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    print(f"jogar_partidas: {verificar(args.partidas, args.seed)} partidas ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# verificacao/posicoes.py
+"""
+Posições para as verificações: partidas semeadas jogadas até o fim com jogadas sorteadas
+entre as legais, para passar por pisos cheios, linhas bloqueadas e empates.
+"""
+
+import random
+from jogo import Jogo
+from jogador import Jogador
+from movimentos import listar_movimentos
+
+
+def posicoes(partidas=20, seed=0, n_jogadores=2):
+    """
+    Gera (jogo, jogador da vez) em cada jogada das partidas. O jogo é o mesmo objeto,
+    alterado depois que o consumidor pede a próxima posição: use-o (ou clone-o) antes disso.
+    """
+    for i in range(partidas):
+        rng = random.Random(seed * 1_000_003 + i)
+        jogo = Jogo([Jogador(f"J{k + 1}", tipo="cpu") for k in range(n_jogadores)], seed=rng.getrandbits(64))
+        while True:
+            jogo.preparar_rodada()
+            vez = 0
+            while True:
+                jogadas = listar_movimentos(jogo, vez)
+                if not jogadas:
+                    break
+                yield jogo, vez
+                jogo.aplicar_movimento(vez, rng.choice(jogadas))
+                vez = (vez + 1) % n_jogadores
+            jogo.fase_parede_e_pontuacao()
+            if jogo.jogo_terminou():
+                break
@@ -0,0 +1,122 @@
+# verificacao/rodadas_lote.py
+"""
+lote.LoteRodadas contra o motor objeto a objeto: as jogadas das políticas "greedy"
+(ai_agents.escolha_gulosa), "first" (primeira de listar_movimentos) e "cpu"
+(Jogador._escolha_cpu), inclusive a ordem de desempate; os playouts de cada opção até o
+fim da rodada e truncados (pontos_apos_rodada, estimativa_parcial); o fim da rodada
+(pontos e descarte). Por último, GreedyAgent(lote=True) contra lote=False em partidas inteiras.
+Uso: python -m verificacao.rodadas_lote [--partidas N] [--seed S]
+"""
+
+import argparse
+import numpy as np
+from ai_agents import escolha_gulosa, estimativa_parcial, pontos_apos_rodada
+from azulejos import contagem_de_lista
+from lote import LoteRodadas
+from movimentos import FONTE_CENTRO, listar_movimentos
+from simulador import run_single_game
+from verificacao.posicoes import posicoes
+
+TRUNCADO = 2  # jogadas do playout truncado depois da opção
+
+
+def _jogada(fonte, cor, linha):
+    return (int(fonte) << 6) | (int(cor) << 3) | (int(linha) + 1)
+
+
+def _jogada_cpu(jogo, idx):
+    estado = {"expositores": jogo.expositores, "centro": jogo.centro, "indice_jogador": idx}
+    escolha = jogo.jogadores[idx]._escolha_cpu(estado)
+    fonte = escolha["fonte"]
+    f = FONTE_CENTRO if fonte[0] == "centro" else fonte[1] + 1
+    return _jogada(f, escolha["cor"].indice, escolha["linha"])
+
+
+def _falha(o_que, obtido, esperado, jogo, idx):
+    raise AssertionError(f"{o_que}: {obtido} != {esperado} ({len(jogo.jogadores)} jogadores, "
+                         f"rodada {jogo.rodada}, vez {idx})")
+
+
+def _conferir_politicas(jogo, idx, jogadas):
+    lote = LoteRodadas.de_jogo(jogo, 1, vez=idx)
+    um = np.array([0])
+    for politica, esperada in (("greedy", escolha_gulosa(jogo, idx, jogadas)), ("first", jogadas[0]),
+                               ("cpu", _jogada_cpu(jogo, idx))):
+        obtida = _jogada(*(v[0] for v in lote.escolher(um, politica)))
+        if obtida != esperada:
+            _falha(f"política {politica}", obtida, esperada, jogo, idx)
+
+
+def _conferir_playouts(jogo, idx, jogadas):
+    """Playout guloso de cada opção como em GreedyAgent.avaliar_lote, contra o mesmo no Jogo."""
+    n_jogadores = len(jogo.jogadores)
+    lote = LoteRodadas.de_jogo(jogo, len(jogadas), vez=idx)
+    movs = np.array(jogadas)
+    lote.aplicar(np.arange(len(movs)), movs >> 6, (movs >> 3) & 7, (movs & 7) - 1)
+    truncado = lote.repetir(1)
+    truncado.jogar("greedy", max_jogadas=TRUNCADO)
+    lote.jogar("greedy")
+    completos = lote.pontos[:, idx] + lote.pontos_fim_rodada()[:, idx]
+    parciais = truncado.estimativa_parcial(idx)
+    for i, jogada in enumerate(jogadas):
+        pilha = [jogo.aplicar_movimento(idx, jogada)]
+        parcial = None
+        while not jogo._todas_fontes_vazias():
+            if len(pilha) == 1 + TRUNCADO:
+                parcial = estimativa_parcial(jogo, idx)
+            vez = (idx + len(pilha)) % n_jogadores
+            pilha.append(jogo.aplicar_movimento(vez, escolha_gulosa(jogo, vez, listar_movimentos(jogo, vez))))
+        if parcial is None:
+            parcial = estimativa_parcial(jogo, idx)
+        if completos[i] != pontos_apos_rodada(jogo, idx):
+            _falha(f"playout de {jogada}", completos[i], pontos_apos_rodada(jogo, idx), jogo, idx)
+        if parciais[i] != parcial:
+            _falha(f"playout truncado de {jogada}", parciais[i], parcial, jogo, idx)
+        if i == 0:
+            _conferir_fim_rodada(lote.selecionar([0]), jogo, idx)
+        for registro in reversed(pilha):
+            jogo.desfazer(registro)
+
+
+def _conferir_fim_rodada(lote, jogo, idx):
+    descarte = lote.finalizar_rodada()[0].tolist()
+    esperado = [0] * 5
+    for p, jogador in enumerate(jogo.jogadores):
+        ganhos, pecas = jogador.tabuleiro.clonar().finalizar_rodada()
+        if lote.pontos[0, p] != jogador.pontos + ganhos:
+            _falha(f"finalizar_rodada do jogador {p}", lote.pontos[0, p], jogador.pontos + ganhos, jogo, idx)
+        esperado = [a + b for a, b in zip(esperado, contagem_de_lista(pecas))]
+    if descarte != esperado:
+        _falha("descarte do fim da rodada", descarte, esperado, jogo, idx)
+
+
+def verificar(partidas=3, seed=0, partidas_agente=2):
+    """Confere as posições e as partidas do GreedyAgent; retorna quantas posições foram conferidas."""
+    n = 0
+    for n_jogadores in (2, 3, 4):
+        for jogo, idx in posicoes(partidas, seed, n_jogadores):
+            jogadas = listar_movimentos(jogo, idx)
+            _conferir_politicas(jogo, idx, jogadas)
+            _conferir_playouts(jogo, idx, jogadas)
+            n += 1
+    for s in range(seed, seed + partidas_agente):
+        for eliminacao in (True, False):
+            resultados = [run_single_game(["greedy", "greedy"], seed=s,
+                                          parametros={"greedy": {"lote": lote, "eliminacao": eliminacao}})
+                          for lote in (False, True)]
+            if resultados[0] != resultados[1]:
+                raise AssertionError(f"GreedyAgent(lote=True, eliminacao={eliminacao}), semente {s}: "
+                                     f"{resultados[1]} != {resultados[0]}")
+    return n
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--partidas", type=int, default=3, help="Partidas por número de jogadores")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    print(f"LoteRodadas: {verificar(args.partidas, args.seed)} posições ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# zobrist.py
+"""
+Hash Zobrist do estado de uma rodada: expositores, centro, token do primeiro jogador
+e, para cada jogador, linhas padrão, parede e piso. Os pontos não entram no hash
+(só mudam no fim da rodada). Jogo mantém o valor em Jogo.hash: recalcula com
+hash_jogo() ao preparar/pontuar a rodada e atualiza incrementalmente em Jogo.aplicar.
+"""
+
+import random
+
+MAX_EXPOSITORES = 9   # 4 jogadores
+MAX_JOGADORES = 4
+MAX_PECAS = 102       # 100 azulejos + token (+1 para a contagem 0): centro e tamanho do piso
+
+_rng = random.Random(0x5A0B1A5)
+
+
+def _chave():
+    return _rng.getrandbits(64)
+
+
+def _tabela_contagens(n):
+    # contagem 0 tem chave 0: fonte vazia não contribui para o hash
+    return [0] + [_chave() for _ in range(n - 1)]
+
+
+ZOB_EXPOSITOR = [[_tabela_contagens(5) for _ in range(5)] for _ in range(MAX_EXPOSITORES)]  # [f][cor][n]
+ZOB_CENTRO = [_tabela_contagens(MAX_PECAS) for _ in range(5)]                              # [cor][n]
+ZOB_TOKEN_CENTRO = _chave()
+ZOB_DONO_TOKEN = [_chave() for _ in range(MAX_JOGADORES)]
+ZOB_LINHA = [[[_tabela_contagens(6) for _ in range(5)] for _ in range(5)]
+             for _ in range(MAX_JOGADORES)]                                                  # [p][linha][cor][n]
+ZOB_PAREDE = [[_chave() for _ in range(25)] for _ in range(MAX_JOGADORES)]                 # [p][posição]
+ZOB_PISO = [_tabela_contagens(MAX_PECAS) for _ in range(MAX_JOGADORES)]                    # [p][tamanho]
+ZOB_VEZ = [_chave() for _ in range(MAX_JOGADORES)]                                          # jogador da vez (busca)
+
+
+def hash_expositor(f, contagem):
+    tabela = ZOB_EXPOSITOR[f]
+    h = 0
+    for k in range(5):
+        h ^= tabela[k][contagem[k]]
+    return h
+
+
+def hash_linha(p, linha, cor, qtd):
+    return ZOB_LINHA[p][linha][cor.indice][qtd] if qtd else 0
+
+
+def hash_jogo(jogo):
+    """Hash completo do estado (usado ao iniciar/pontuar a rodada; depois é incremental)."""
+    h = 0
+    for f, e in enumerate(jogo.expositores):
+        h ^= hash_expositor(f, e.contagem)
+    for k in range(5):
+        h ^= ZOB_CENTRO[k][jogo.centro.contagem[k]]
+    if jogo.centro.token_primeiro:
+        h ^= ZOB_TOKEN_CENTRO
+    if jogo.owner_first_token is not None:
+        h ^= ZOB_DONO_TOKEN[jogo.jogadores.index(jogo.owner_first_token)]
+    for p, jogador in enumerate(jogo.jogadores):
+        t = jogador.tabuleiro
+        for linha in range(5):
+            h ^= hash_linha(p, linha, t.linha_cor[linha], t.linha_qtd[linha])
+        bits = t.parede_bits
+        for pos in range(25):
+            if bits >> pos & 1:
+                h ^= ZOB_PAREDE[p][pos]
+        h ^= ZOB_PISO[p][len(t.piso)]
+    return h